@@ -0,0 +1,327 @@
+"""Pinned copy of the f-string renderer the Jinja2 templates replaced; a benchmark baseline only.
+
+The inline stylesheet is read from templates/resume/resume.css instead of being
+repeated here; the rest is the old function as it was.
+"""
+import os
+
+with open(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "resume", "resume.css"),
+    encoding="utf-8",
+) as f:
+    STYLESHEET = f.read()
+
+def generate_resume_html(resume):
+    # Check if we need two-column layout (more than 4 sections with content)
+    has_projects = resume.get('projects') and len(resume['projects']) > 0
+    has_certificates = resume.get('certificates') and len(resume['certificates']) > 0
+    has_achievements = resume.get('achievements') and len(resume['achievements']) > 0
+    has_skills = resume.get('skills') and len(resume['skills']) > 0
+    has_experience = resume.get('experience') and len(resume['experience']) > 0
+    has_education = resume.get('education') and len(resume['education']) > 0
+    has_links = resume.get('links') and len(resume['links']) > 0
+    has_summary = resume.get('personal_info') and resume['personal_info'].get('summary')
+    
+    section_count = [
+        has_projects, 
+        has_certificates, 
+        has_achievements, 
+        has_skills, 
+        has_experience, 
+        has_education, 
+        has_links, 
+        has_summary
+    ].count(True)
+    
+    use_two_columns = section_count > 4
+    
+    # Generate contact info HTML
+    contact_info_html = ""
+    if resume['personal_info'].get('email'):
+        contact_info_html += f"""
+            <div class="contact-item">
+                <span>{resume['personal_info']['email']}</span>
+            </div>
+        """
+    if resume['personal_info'].get('phone'):
+        contact_info_html += f"""
+            <div class="contact-item">
+                <span>{resume['personal_info']['phone']}</span>
+            </div>
+        """
+    if resume['personal_info'].get('address'):
+        contact_info_html += f"""
+            <div class="contact-item">
+                <span>{resume['personal_info']['address']}</span>
+            </div>
+        """
+    if has_links:
+        links_html = ""
+        for i, link in enumerate(resume['links']):
+            links_html += f"""
+                <a href="{link['url']}" target="_blank" rel="noopener noreferrer" class="link-platform">
+                    {link['platform']}{', ' if i < len(resume['links']) - 1 else ''}
+                </a>
+            """
+        contact_info_html += f"""
+            <div class="contact-item links-inline">
+                {links_html}
+            </div>
+        """
+    
+    # Generate left column HTML
+    left_column_html = ""
+    if has_summary:
+        left_column_html += f"""
+            <div class="resume-section">
+                <div class="section-header">
+                    <h2>Professional Summary</h2>
+                </div>
+                <div class="section-content">
+                    <p>{resume['personal_info']['summary']}</p>
+                </div>
+            </div>
+        """
+    
+    if has_experience:
+        experience_html = ""
+        for exp in resume['experience']:
+            period_html = f"<span class='date'>{exp['period']}</span>" if exp.get('period') else ""
+            company_html = f"<span class='company'>{exp['company']}</span>" if exp.get('company') else ""
+            description_html = f"""
+                <div class="item-description">
+                    <p>{exp['description']}</p>
+                </div>
+            """ if exp.get('description') else ""
+            
+            experience_html += f"""
+                <div class="experience-item">
+                    <div class="item-header">
+                        <h3>{exp['title']}</h3>
+                        <div class="date-location">
+                            {period_html}
+                            {company_html}
+                        </div>
+                    </div>
+                    {description_html}
+                </div>
+            """
+        
+        left_column_html += f"""
+            <div class="resume-section">
+                <div class="section-header">
+                    <h2>Work Experience</h2>
+                </div>
+                <div class="section-content">
+                    {experience_html}
+                </div>
+            </div>
+        """
+    
+    if has_projects:
+        projects_html = ""
+        for project in resume['projects']:
+            period_html = f"<span class='date'>{project['period']}</span>" if project.get('period') else ""
+            tech_html = f"<span class='technologies'>{project['technologies']}</span>" if project.get('technologies') else ""
+            description_html = f"""
+                <div class="item-description">
+                    <p>{project['description']}</p>
+                </div>
+            """ if project.get('description') else ""
+            
+            link_html = ""
+            if project.get('link'):
+                link_html = f"""
+                    <div class="project-link">
+                        <a href="{project['link']}" target="_blank" rel="noopener noreferrer">
+                            View Project
+                        </a>
+                    </div>
+                """
+            
+            projects_html += f"""
+                <div class="project-item">
+                    <div class="item-header">
+                        <h3>{project['name']}</h3>
+                        <div class="date-location">
+                            {period_html}
+                            {tech_html}
+                        </div>
+                    </div>
+                    {description_html}
+                    {link_html}
+                </div>
+            """
+        
+        left_column_html += f"""
+            <div class="resume-section">
+                <div class="section-header">
+                    <h2>Projects</h2>
+                </div>
+                <div class="section-content">
+                    {projects_html}
+                </div>
+            </div>
+        """
+    
+    if has_skills:
+        skills_html = "".join([f"<div class='skill-tag'>{skill}</div>" for skill in resume['skills']])
+        left_column_html += f"""
+            <div class="resume-section">
+                <div class="section-header">
+                    <h2>Skills</h2>
+                </div>
+                <div class="section-content">
+                    <div class="skills-container">
+                        {skills_html}
+                    </div>
+                </div>
+            </div>
+        """
+    
+    # Generate right column HTML
+    right_column_html = ""
+    if has_education:
+        education_html = ""
+        for edu in resume['education']:
+            period_html = f"<span class='date'>{edu['period']}</span>" if edu.get('period') else ""
+            institution_html = f"<span class='institution'>{edu['institution']}</span>" if edu.get('institution') else ""
+            description_html = f"""
+                <div class="item-description">
+                    <p>{edu['description']}</p>
+                </div>
+            """ if edu.get('description') else ""
+            
+            education_html += f"""
+                <div class="education-item">
+                    <div class="item-header">
+                        <h3>{edu['degree']}</h3>
+                        <div class="date-location">
+                            {period_html}
+                            {institution_html}
+                        </div>
+                    </div>
+                    {description_html}
+                </div>
+            """
+        
+        right_column_html += f"""
+            <div class="resume-section">
+                <div class="section-header">
+                    <h2>Education</h2>
+                </div>
+                <div class="section-content">
+                    {education_html}
+                </div>
+            </div>
+        """
+    
+    if has_certificates:
+        certificates_html = ""
+        for cert in resume['certificates']:
+            date_html = f"<span class='date'>{cert['date']}</span>" if cert.get('date') else ""
+            issuer_html = f"<span class='issuer'>{cert['issuer']}</span>" if cert.get('issuer') else ""
+            
+            link_html = ""
+            if cert.get('credentialLink'):
+                link_html = f"""
+                    <div class="certificate-link">
+                        <a href="{cert['credentialLink']}" target="_blank" rel="noopener noreferrer">
+                            Verify Credential
+                        </a>
+                    </div>
+                """
+            
+            certificates_html += f"""
+                <div class="certificate-item">
+                    <div class="item-header">
+                        <h3>{cert['name']}</h3>
+                        <div class="date-location">
+                            {date_html}
+                            {issuer_html}
+                        </div>
+                    </div>
+                    {link_html}
+                </div>
+            """
+        
+        right_column_html += f"""
+            <div class="resume-section">
+                <div class="section-header">
+                    <h2>Certifications</h2>
+                </div>
+                <div class="section-content">
+                    {certificates_html}
+                </div>
+            </div>
+        """
+    
+    if has_achievements:
+        achievements_html = ""
+        for achievement in resume['achievements']:
+            date_html = f"<span class='date'>{achievement['date']}</span>" if achievement.get('date') else ""
+            description_html = f"""
+                <div class="item-description">
+                    <p>{achievement['description']}</p>
+                </div>
+            """ if achievement.get('description') else ""
+            
+            achievements_html += f"""
+                <div class="achievement-item">
+                    <div class="item-header">
+                        <h3>{achievement['title']}</h3>
+                        {date_html}
+                    </div>
+                    {description_html}
+                </div>
+            """
+        
+        right_column_html += f"""
+            <div class="resume-section">
+                <div class="section-header">
+                    <h2>Achievements</h2>
+                </div>
+                <div class="section-content">
+                    {achievements_html}
+                </div>
+            </div>
+        """
+    
+    return f"""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{resume.get('version_name', 'Resume')}</title>
+    <style>
+{STYLESHEET}
+    </style>
+</head>
+<body>
+    <div class="resume-preview">
+        <div class="resume-a4-template">
+            <div class="resume-header">
+                <div class="name-title">
+                    <h1>{resume['personal_info']['name']}</h1>
+                    {resume['personal_info'].get('title') and f'<p class="professional-title">{resume["personal_info"]["title"]}</p>' or ''}
+                </div>
+                
+                <div class="contact-info">
+                    {contact_info_html}
+                </div>
+            </div>
+            
+            <div class="resume-content {'two-columns' if use_two_columns else ''}">
+                <div class="content-column">
+                    {left_column_html}
+                </div>
+
+                <div class="content-column">
+                    {right_column_html}
+                </div>
+            </div>
+        </div>
+    </div>
+</body>
+</html>
+    """
@@ -0,0 +1,28 @@
+"""Time every registered export format, uncached and from its cache.
+
+The lite PDF renderer is included for comparison.
+
+Run from the backend directory:  python -m benchmarks.bench_exports
+"""
+import timeit
+from benchmarks.sample_data import make_resume
+from utils.exporters import EXPORTERS, stream_export
+from utils.lite_pdf import render_lite_pdf
+
+def bench(label: str, fn, number: int):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5))
+    print(f"{label:<28} {seconds / number * 1e6:>10.1f} us/export")
+
+def main():
+    for items in (1, 5, 20):
+        resume = make_resume(items)
+        number = 1000 if items < 20 else 200
+        print(f"\n{items} item(s) per section")
+        for name, exporter in EXPORTERS.items():
+            bench(f"{name} uncached", lambda: b"".join(exporter.render(resume)), number)
+            b"".join(stream_export(resume, name))
+            bench(f"{name} cached", lambda: b"".join(stream_export(resume, name)), number)
+        bench("lite pdf", lambda: render_lite_pdf(resume), number)
+
+if __name__ == "__main__":
+    main()
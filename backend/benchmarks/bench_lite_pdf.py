@@ -0,0 +1,24 @@
+"""Time the in-process lite PDF renderer.
+
+wkhtmltopdf renders typically take hundreds of milliseconds to seconds per
+resume; the lite renderer should stay in the low milliseconds.
+
+Run from the backend directory:  python -m benchmarks.bench_lite_pdf
+"""
+import timeit
+from benchmarks.sample_data import make_resume
+from utils.lite_pdf import layout_resume, render_lite_pdf
+
+def main():
+    for items in (1, 5, 20):
+        resume = make_resume(items)
+        number = 500 if items < 20 else 100
+        seconds = min(timeit.repeat(lambda: render_lite_pdf(resume), number=number, repeat=5))
+        pdf = render_lite_pdf(resume)
+        print(
+            f"{items:>2} item(s) per section: {seconds / number * 1e3:>6.2f} ms/render, "
+            f"{len(layout_resume(resume))} page(s), {len(pdf) / 1024:.1f} KiB"
+        )
+
+if __name__ == "__main__":
+    main()
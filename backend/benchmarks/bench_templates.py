@@ -0,0 +1,49 @@
+"""Compare the Jinja2 resume templates with the f-string renderer they replaced.
+
+Jinja2 timings are given cold (empty fragment cache), after a single-section
+edit, and warm (every section fragment cached). Cold and edited renders are
+slower than the f-string baseline at every size; warm renders only break even
+at about 20 items per section.
+
+Run from the backend directory:  python -m benchmarks.bench_templates
+"""
+import timeit
+from benchmarks.baseline_render import generate_resume_html as baseline_render
+from benchmarks.sample_data import make_resume
+from utils.templates import RESUME_TEMPLATES, fragment_cache, load_templates, render_resume_html
+
+def bench(label: str, fn, number: int):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5))
+    print(f"{label:<32} {seconds / number * 1e6:>10.1f} us/render")
+
+def main():
+    start = timeit.default_timer()
+    load_templates()
+    print(f"template compile/load: {(timeit.default_timer() - start) * 1e3:.1f} ms (once per process)")
+
+    for items in (1, 5, 20):
+        resume = make_resume(items)
+        number = 2000 if items < 20 else 500
+        print(f"\n{items} item(s) per section")
+        bench("f-string baseline", lambda: baseline_render(resume), number)
+        edited = dict(resume)
+        toggle = [False]
+
+        def cold(name):
+            fragment_cache.clear()
+            render_resume_html(resume, name)
+
+        def edit_skills(name):
+            # Alternate between two skill lists, as a user saving small edits would
+            toggle[0] = not toggle[0]
+            edited["skills"] = resume["skills"][:-1] if toggle[0] else resume["skills"]
+            edited["revision"] += 1
+            render_resume_html(edited, name)
+
+        for name in RESUME_TEMPLATES:
+            bench(f"jinja2 '{name}' cold", lambda: cold(name), number)
+            bench(f"jinja2 '{name}' skills edited", lambda: edit_skills(name), number)
+            bench(f"jinja2 '{name}' warm", lambda: render_resume_html(resume, name), number)
+
+if __name__ == "__main__":
+    main()
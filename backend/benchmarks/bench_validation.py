@@ -0,0 +1,39 @@
+"""Time validation of large resume payloads with the typed models.
+
+Covers the request path (ResumeCreate from a dict and from raw JSON) and the
+section lists on their own, with a TypeAdapter built once at module level,
+one built per call, and the old untyped List[dict] sections for comparison.
+
+Run from the backend directory:  python -m benchmarks.bench_validation
+"""
+from typing import List
+import timeit
+from pydantic import TypeAdapter
+from benchmarks.sample_data import make_resume
+from models.resume import Project, ResumeCreate
+from utils.serialization import dumps
+
+# Compiled once; every call below reuses the same validator
+projects_adapter = TypeAdapter(List[Project])
+untyped_adapter = TypeAdapter(List[dict])
+
+def bench(label: str, fn, number: int):
+    seconds = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"{label:<32} {seconds * 1e6:>10.1f} us")
+
+def main():
+    for items in (5, 50, 500):
+        resume = make_resume(items)
+        payload = {key: resume[key] for key in ResumeCreate.model_fields}
+        raw = dumps(payload)
+        projects = resume["projects"]
+        number = max(2000 // items, 5)
+        print(f"\n{items} item(s) per section, {len(raw) // 1024} KiB of JSON")
+        bench("ResumeCreate from dict", lambda: ResumeCreate.model_validate(payload), number)
+        bench("ResumeCreate from JSON", lambda: ResumeCreate.model_validate_json(raw), number)
+        bench("projects, module-level adapter", lambda: projects_adapter.validate_python(projects), number)
+        bench("projects, adapter per call", lambda: TypeAdapter(List[Project]).validate_python(projects), number)
+        bench("projects as List[dict]", lambda: untyped_adapter.validate_python(projects), number)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+from datetime import datetime
+from bson import ObjectId
+
+def make_resume(items: int = 5) -> dict:
+    """A stored resume document with `items` entries in every list section"""
+    return {
+        "_id": ObjectId(),
+        "user_id": ObjectId(),
+        "version_name": "Benchmark Resume",
+        "revision": 1,
+        "personal_info": {
+            "name": "Jordan Example",
+            "email": "jordan@example.com",
+            "phone": "+1 555 0100",
+            "address": "12 Sample Street, Springfield",
+            "summary": "Engineer with a long track record of shipping things & <measuring> them. " * 4,
+            "title": "Senior Software Engineer",
+        },
+        "experience": [
+            {
+                "id": ObjectId(),
+                "title": f"Engineer {i}",
+                "company": f"Company {i}",
+                "period": "2019 - 2023",
+                "description": "Built and operated services handling millions of requests per day. " * 3,
+            }
+            for i in range(items)
+        ],
+        "education": [
+            {
+                "id": ObjectId(),
+                "degree": f"Degree {i}",
+                "institution": f"University {i}",
+                "period": "2012 - 2016",
+                "description": "Coursework in distributed systems and databases.",
+            }
+            for i in range(items)
+        ],
+        "skills": [f"Skill {i}" for i in range(items * 4)],
+        "projects": [
+            {
+                "name": f"Project {i}",
+                "period": "2022",
+                "technologies": "Python, FastAPI, MongoDB",
+                "description": "An open-source tool for generating reports. " * 2,
+                "link": f"https://example.com/project/{i}",
+            }
+            for i in range(items)
+        ],
+        "certificates": [
+            {
+                "name": f"Certificate {i}",
+                "issuer": "Cert Authority",
+                "date": "2021",
+                "credentialLink": f"https://example.com/cert/{i}",
+            }
+            for i in range(items)
+        ],
+        "achievements": [
+            {"title": f"Award {i}", "date": "2020", "description": "Recognised for outstanding work."}
+            for i in range(items)
+        ],
+        "links": [
+            {"platform": "GitHub", "url": "https://github.com/example"},
+            {"platform": "LinkedIn", "url": "https://linkedin.com/in/example"},
+        ],
+        "created_at": datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
@@ -1,15 +1,36 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import auth, resume, user
+from routes import auth, resume, user, share
 from contextlib import asynccontextmanager
-from utils.database import connect_db, close_db
+from utils.database import connect_db, close_db, get_db
+from utils.indexes import ensure_indexes
+from utils.render_pool import render_pool
+from utils.pdf_cache import pdf_cache
+from utils.templates import load_templates
+from utils.prerender import cancel_prerenders
+from utils.render_jobs import render_jobs
+from utils.pdf_service import render_flights
+from utils.exporters import export_cache_stats
+from utils.db_metrics import DB_ROUND_TRIP_HEADER, track_round_trips
+from utils.activity_sink import activity_sink
+from utils.password_hasher import password_hasher
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: connect to database
+    # Startup: connect to database, apply the index registry, compile templates and warm up the PDF render workers
     await connect_db()
+    await ensure_indexes(get_db())
+    activity_sink.start()
+    load_templates()
+    await render_pool.start()
+    await render_jobs.start()
     yield
-    # Shutdown: close database connection
+    # Shutdown: drop pending pre-renders and render jobs, stop PDF render workers and password hashing threads, flush activity events and close database connection
+    cancel_prerenders()
+    await render_jobs.stop()
+    render_pool.stop()
+    password_hasher.stop()
+    await activity_sink.stop()
     await close_db()
 
 app = FastAPI(
@@ -26,17 +47,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lets the frontend read resume ETags for If-None-Match / If-Match
+    expose_headers=["ETag"],
 )
 
+if DB_ROUND_TRIP_HEADER:
+    @app.middleware("http")
+    async def count_db_round_trips(request, call_next):
+        counter = track_round_trips()
+        response = await call_next(request)
+        response.headers["X-DB-Round-Trips"] = str(counter[0])
+        return response
+
 # Include routers
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(user.router, prefix="/api/users", tags=["Users"])
 app.include_router(resume.router, prefix="/api/resumes", tags=["Resumes"])
+app.include_router(share.router, tags=["Shared resumes"])
 
 @app.get("/")
 async def root():
     return {"message": "Resume Platform API is running!"}
 
+@app.get("/health/renderer")
+async def renderer_health():
+    return {
+        "pool": render_pool.health(),
+        "cache": pdf_cache.stats(),
+        "single_flight": render_flights.stats(),
+        "exports": export_cache_stats(),
+    }
+
+@app.get("/health/activity")
+async def activity_health():
+    return activity_sink.stats()
+
+@app.get("/health/auth")
+async def auth_health():
+    return {"password_hasher": password_hasher.stats()}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
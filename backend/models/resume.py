@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List, Literal, Union
 from datetime import datetime
 from bson import ObjectId
 from .user import PyObjectId
@@ -13,47 +13,63 @@ class PersonalInfo(BaseModel):
     title: str = ""
 
 class Experience(BaseModel):
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
     title: str
     company: str
     period: str
     description: str
 
-    class Config:
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    # Items are stored under "id" by model_dump(); read them back with the same id
+    model_config = ConfigDict(populate_by_name=True)
 
 class Education(BaseModel):
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
     degree: str
     institution: str
     period: str
     description: str
 
-    class Config:
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
+
+# Field names match the resume form in the frontend and the section templates
+class Project(BaseModel):
+    name: str
+    technologies: str = ""
+    period: str = ""
+    description: str = ""
+    link: str = ""
+
+class Certificate(BaseModel):
+    name: str
+    issuer: str = ""
+    date: str = ""
+    credentialLink: str = ""
+
+class Achievement(BaseModel):
+    title: str
+    date: str = ""
+    description: str = ""
+
+class Link(BaseModel):
+    platform: str
+    url: str
 
 # resume.py - Update the ResumeVersion model
 class ResumeVersion(BaseModel):
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
     user_id: PyObjectId
     version_name: str
     personal_info: PersonalInfo
     experience: List[Experience] = []
     education: List[Education] = []
     skills: List[str] = []
-    projects: List[dict] = []  # Add this
-    certificates: List[dict] = []  # Add this
-    achievements: List[dict] = []  # Add this
-    links: List[dict] = []  # Add this
+    projects: List[Project] = []
+    certificates: List[Certificate] = []
+    achievements: List[Achievement] = []
+    links: List[Link] = []
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-
 # resume.py - Update the create and update models
 class ResumeCreate(BaseModel):
     version_name: str
@@ -61,10 +77,10 @@ class ResumeCreate(BaseModel):
     experience: List[Experience] = []
     education: List[Education] = []
     skills: List[str] = []
-    projects: List[dict] = []
-    certificates: List[dict] = []
-    achievements: List[dict] = []
-    links: List[dict] = []
+    projects: List[Project] = []
+    certificates: List[Certificate] = []
+    achievements: List[Achievement] = []
+    links: List[Link] = []
 
 class ResumeUpdate(BaseModel):
     version_name: Optional[str] = None
@@ -72,33 +88,40 @@ class ResumeUpdate(BaseModel):
     experience: Optional[List[Experience]] = None
     education: Optional[List[Education]] = None
     skills: Optional[List[str]] = None
-    projects: Optional[List[dict]] = None
-    certificates: Optional[List[dict]] = None
-    achievements: Optional[List[dict]] = None
-    links: Optional[List[dict]] = None
+    projects: Optional[List[Project]] = None
+    certificates: Optional[List[Certificate]] = None
+    achievements: Optional[List[Achievement]] = None
+    links: Optional[List[Link]] = None
 
 class ResumeResponse(ResumeVersion):
     pass
 
+class ResumeExportRequest(BaseModel):
+    resume_ids: Union[Literal["all"], List[str]] = "all"
+    template: str = "classic"
+
+class ShareCreate(BaseModel):
+    template: str = "classic"
+
+class ShareResponse(BaseModel):
+    token: str
+    resume_id: str
+    template: str
+    url: str
+    created_at: datetime
+
 class ActivityLog(BaseModel):
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
     user_id: PyObjectId
     activity_type: str  # 'created', 'updated', 'downloaded', etc.
     resume_id: Optional[PyObjectId] = None
     details: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
-    class Config:
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-
 class ActivityResponse(BaseModel):
     id: str
     user_id: str
     activity_type: str
     resume_id: Optional[str] = None
     details: str
-    created_at: datetime
-
-    class Config:
-        json_encoders = {ObjectId: str}
\ No newline at end of file
+    created_at: datetime
\ No newline at end of file
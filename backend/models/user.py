@@ -1,22 +1,32 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
+from pydantic_core import core_schema
+from typing import Annotated, Optional, List
 from datetime import datetime
 from bson import ObjectId
 
-class PyObjectId(ObjectId):
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+def validate_object_id(value) -> ObjectId:
+    if isinstance(value, ObjectId):
+        return value
+    if isinstance(value, str) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    raise ValueError("Invalid objectid")
+
+class _ObjectIdSchema:
+    """pydantic v2 schema for ObjectId: accepts ObjectId or its hex string, dumps a string in JSON mode"""
 
     @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid objectid")
-        return ObjectId(v)
+    def __get_pydantic_core_schema__(cls, source_type, handler):
+        # model_dump() keeps the ObjectId for MongoDB; only JSON output turns it into a string
+        return core_schema.no_info_plain_validator_function(
+            validate_object_id,
+            serialization=core_schema.plain_serializer_function_ser_schema(str, when_used="json"),
+        )
 
     @classmethod
-    def __modify_schema__(cls, field_schema):
-        field_schema.update(type="string")
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return {"type": "string", "pattern": "^[0-9a-f]{24}$"}
+
+PyObjectId = Annotated[ObjectId, _ObjectIdSchema]
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -35,7 +45,7 @@ class UserUpdate(BaseModel):
     address: Optional[str] = None
 
 class UserInDB(UserBase):
-    id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    id: PyObjectId = Field(default_factory=ObjectId, alias="_id")
     hashed_password: str
     phone: Optional[str] = None
     address: Optional[str] = None
@@ -43,17 +53,21 @@ class UserInDB(UserBase):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     is_active: bool = True
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class SessionResponse(BaseModel):
+    id: str
+    user_agent: Optional[str] = None
+    created_at: datetime
+    last_used_at: datetime
+    expires_at: datetime
 
 class UserResponse(UserBase):
     id: str
     phone: Optional[str] = None
     address: Optional[str] = None
     created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        json_encoders = {ObjectId: str}
\ No newline at end of file
+    updated_at: datetime
\ No newline at end of file
@@ -1,20 +1,32 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
-from models.user import UserCreate, UserResponse, UserInDB
+from models.user import UserCreate, UserResponse, UserInDB, RefreshRequest, SessionResponse
+from typing import List
 from utils.auth import (
-    get_password_hash, 
-    verify_password, 
+    hash_password, 
+    verify_and_update_password, 
     create_access_token, 
     get_current_active_user,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 from utils.database import get_user_collection
+from utils.password_hasher import PasswordHasherBusy
+from utils.user_cache import user_cache
+from utils.sessions import create_session, rotate_session, revoke_session
+from utils.database import get_session_collection
 from bson import ObjectId
 from datetime import datetime
 
 router = APIRouter()
 
+def password_hasher_busy(e: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-in attempts right now, please retry shortly",
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
 def format_user(user: dict) -> dict:
     """Format MongoDB user document for UserResponse"""
     # Handle both MongoDB documents (_id) and Pydantic models (id)
@@ -43,41 +55,114 @@ async def register(user: UserCreate):
         )
     
     # Create new user
-    hashed_password = get_password_hash(user.password)
-    user_dict = user.dict()
+    try:
+        hashed_password = await hash_password(user.password)
+    except PasswordHasherBusy as e:
+        raise password_hasher_busy(e)
+    user_dict = user.model_dump()
     user_dict["hashed_password"] = hashed_password
     del user_dict["password"]
     
     user_in_db = UserInDB(**user_dict)
-    result = await user_collection.insert_one(user_in_db.dict(by_alias=True))
+    result = await user_collection.insert_one(user_in_db.model_dump(by_alias=True))
     
     # Fetch new user and format for response
     new_user = await user_collection.find_one({"_id": result.inserted_id})
     return UserResponse(**format_user(new_user))
 
 @router.post("/login")
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
     user_collection = get_user_collection()
     
     user = await user_collection.find_one({"email": form_data.username})
-    if not user or not verify_password(form_data.password, user["hashed_password"]):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await verify_and_update_password(form_data.password, user["hashed_password"])
+        except PasswordHasherBusy as e:
+            raise password_hasher_busy(e)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    if new_hash:
+        # Hashed with outdated settings (e.g. fewer BCRYPT_ROUNDS); upgrade while we have the password
+        await user_collection.update_one(
+            {"_id": user["_id"], "hashed_password": user["hashed_password"]},
+            {"$set": {"hashed_password": new_hash}}
+        )
+        user_cache.invalidate(str(user["_id"]))
+    
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": str(user["_id"])}, expires_delta=access_token_expires
     )
+    refresh_token = await create_session(user["_id"], request.headers.get("user-agent"))
     
     return {
         "access_token": access_token,
+        "refresh_token": refresh_token,
         "token_type": "bearer",
         "user": UserResponse(**format_user(user))
     }
 
+@router.post("/refresh")
+async def refresh(body: RefreshRequest):
+    # One indexed update and no password hashing; the refresh token is single-use
+    rotated = await rotate_session(body.refresh_token)
+    if rotated is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    user_id, refresh_token = rotated
+    access_token = create_access_token(
+        data={"sub": str(user_id)}, expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+
+@router.post("/logout")
+async def logout(body: RefreshRequest):
+    await revoke_session(body.refresh_token)
+    return {"message": "Logged out successfully"}
+
+@router.get("/sessions", response_model=List[SessionResponse])
+async def list_sessions(current_user: UserInDB = Depends(get_current_active_user)):
+    session_collection = get_session_collection()
+    sessions = await session_collection.find(
+        {"user_id": current_user.id},
+        {"token": 0, "previous": 0}
+    ).sort("last_used_at", -1).to_list(100)
+    return [SessionResponse(id=str(session.pop("_id")), **session) for session in sessions]
+
+@router.delete("/sessions/{session_id}")
+async def delete_session(
+    session_id: str,
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    session_collection = get_session_collection()
+    result = await session_collection.delete_one({
+        "_id": ObjectId(session_id),
+        "user_id": current_user.id
+    })
+    
+    if result.deleted_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found"
+        )
+    
+    return {"message": "Session revoked successfully"}
+
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(current_user: UserInDB = Depends(get_current_active_user)):
     # Directly return the UserResponse from the current_user
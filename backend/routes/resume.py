@@ -1,53 +1,136 @@
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
-from fastapi.responses import FileResponse
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Query, Header
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from typing import List, Optional
 from datetime import datetime
-import os, tempfile, pdfkit
+import asyncio
 from models.resume import (
     ResumeCreate, 
     ResumeUpdate, 
     ResumeResponse, 
-    ActivityLog,
     ResumeVersion,
-    ActivityResponse
+    ActivityResponse,
+    ResumeExportRequest,
+    ShareCreate,
+    ShareResponse
 )
 from models.user import UserInDB
 from utils.auth import get_current_active_user
-from utils.database import get_resume_collection, get_activity_collection
+from utils.database import get_resume_collection, get_activity_collection, get_share_collection
+from utils import resume_store
+from utils.resume_store import (
+    DuplicateVersionName, RevisionMismatch, LIST_MAX_LIMIT, listing_projection, decode_cursor,
+    resume_etag, if_match_revisions
+)
+from utils.activity_sink import activity_sink
+from utils.activity_stats import ROLLUP_RETENTION_DAYS, get_activity_stats
+from utils.pdf_cache import pdf_cache
+from utils.render_pool import render_pool, RenderQueueFull
+from utils.pdf_renderer import pdf_cache_key, PDF_ENGINES, DEFAULT_PDF_ENGINE
+from utils.lite_pdf import render_lite_pdf
+from utils.pdf_service import render_pdf
+from utils.prerender import schedule_prerender
+from utils.render_jobs import render_jobs, RenderJobQueueFull, job_status
+from utils.bulk_export import stream_resume_zip, EXPORT_MAX_RESUMES
+from utils.exporters import EXPORTERS, stream_export
+from utils.thumbnails import thumbnail_cache, thumbnail_key, generate_thumbnail, ThumbnailError
+from utils.share_store import new_share_token, publish_share, refresh_shares, revoke_share, revoke_shares
+from utils.responses import pdf_response, content_disposition, etag_matches, MongoJSONResponse
+from utils.serialization import project
+from utils.hashing import stable_hash
+from utils.templates import DEFAULT_TEMPLATE, RESUME_TEMPLATES
 from bson import ObjectId
+import hashlib
 import json
 from bson.errors import InvalidId
 
 router = APIRouter()
 
 async def log_activity(user_id: str, activity_type: str, details: str, resume_id: str = None):
-    activity_collection = get_activity_collection()
-    activity = ActivityLog(
-        user_id=ObjectId(user_id),
-        activity_type=activity_type,
-        resume_id=ObjectId(resume_id) if resume_id else None,
-        details=details
-    )
-    await activity_collection.insert_one(activity.dict(by_alias=True))
+    # Buffered and written in batches by the activity sink
+    activity_sink.log(user_id, activity_type, details, resume_id)
+
+def revalidate_headers(etag: str) -> dict:
+    # Clients may keep their copy but must revalidate it; an unchanged resource costs a 304
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def check_template(template: str):
+    if template not in RESUME_TEMPLATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown template. Available templates: {', '.join(RESUME_TEMPLATES)}"
+        )
 
 @router.get("/", response_model=List[ResumeResponse])
-async def get_user_resumes(current_user: UserInDB = Depends(get_current_active_user)):
+async def get_user_resumes(
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_active_user)
+):
     resume_collection = get_resume_collection()
     resumes = await resume_collection.find({"user_id": current_user.id}).to_list(100)
     
-    # Ensure proper serialization by using the response model
-    return [ResumeResponse(**resume) for resume in resumes]
+    # Versions and their revisions determine the whole body, so a match skips serializing it
+    headers = revalidate_headers(f'"{stable_hash([resume_etag(resume) for resume in resumes])}"')
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    # Documents come from our own database: shape them like ResumeResponse without re-validating
+    return MongoJSONResponse([project(resume, ResumeResponse) for resume in resumes], headers=headers)
+
+# Declared before /{resume_id} so "list" is not taken for an id
+@router.get("/list")
+async def list_resumes(
+    limit: int = Query(20, ge=1, le=LIST_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    summary: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    try:
+        projection = listing_projection(fields, summary)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    resumes, next_cursor = await resume_store.list_resumes(current_user.id, projection, limit, after)
+    for resume in resumes:
+        # Dashboards build ?v=<thumbnail_key> URLs straight from the listing
+        resume["thumbnail_key"] = thumbnail_key(resume)
+        resume.pop("revision", None)
+    
+    # Documents go out as stored; the projection already limits them to listed fields
+    response = MongoJSONResponse({
+        "items": resumes,
+        "next_cursor": next_cursor
+    })
+    # Projections may leave out the revision, so the page is identified by its bytes
+    headers = revalidate_headers(f'"{hashlib.sha256(response.body).hexdigest()}"')
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return response
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
 async def get_resume(
     resume_id: str, 
+    if_none_match: Optional[str] = Header(None),
     current_user: UserInDB = Depends(get_current_active_user)
 ):
     resume_collection = get_resume_collection()
-    resume = await resume_collection.find_one({
+    query = {
         "_id": ObjectId(resume_id),
         "user_id": current_user.id
-    })
+    }
+    if if_none_match:
+        # Polling clients usually hold the current revision: check it without loading the document
+        current = await resume_collection.find_one(query, {"revision": 1})
+        if current and etag_matches(if_none_match, resume_etag(current)):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=revalidate_headers(resume_etag(current)))
+    
+    resume = await resume_collection.find_one(query)
     
     if not resume:
         raise HTTPException(
@@ -55,7 +138,7 @@ async def get_resume(
             detail="Resume not found"
         )
     
-    return ResumeResponse(**resume)
+    return MongoJSONResponse(project(resume, ResumeResponse), headers=revalidate_headers(resume_etag(resume)))
 
 @router.post("/", response_model=ResumeResponse)
 async def create_resume(
@@ -63,45 +146,33 @@ async def create_resume(
     background_tasks: BackgroundTasks,
     current_user: UserInDB = Depends(get_current_active_user)
 ):
-    resume_collection = get_resume_collection()
-    
-    # Check if version name already exists for this user
-    existing_resume = await resume_collection.find_one({
-        "user_id": current_user.id,
-        "version_name": resume.version_name
-    })
-    
-    if existing_resume:
+    # One round trip: the unique (user_id, version_name) index rejects duplicates
+    try:
+        new_resume = await resume_store.insert_resume(current_user.id, resume.model_dump())
+    except DuplicateVersionName:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Version name already exists for this user"
         )
     
-    # Create new resume
-    resume_dict = resume.dict()
-    resume_dict["user_id"] = current_user.id
-    resume_dict["created_at"] = datetime.utcnow()
-    resume_dict["updated_at"] = datetime.utcnow()
-    
-    result = await resume_collection.insert_one(resume_dict)
-    new_resume = await resume_collection.find_one({"_id": result.inserted_id})
-    
     # Log activity
     background_tasks.add_task(
         log_activity, 
         str(current_user.id), 
         "created", 
         f"Created resume version: {resume.version_name}",
-        str(result.inserted_id)
+        str(new_resume["_id"])
     )
+    background_tasks.add_task(schedule_prerender, new_resume)
     
-    return ResumeResponse(**new_resume)
+    return MongoJSONResponse(project(new_resume, ResumeResponse), headers=revalidate_headers(resume_etag(new_resume)))
 
 @router.put("/{resume_id}", response_model=ResumeResponse)
 async def update_resume(
     resume_id: str,
     resume_update: ResumeUpdate,
     background_tasks: BackgroundTasks,
+    if_match: Optional[str] = Header(None),
     current_user: UserInDB = Depends(get_current_active_user)
 ):
     try:
@@ -113,64 +184,48 @@ async def update_resume(
             detail="Invalid resume ID format"
         )
     
-    resume_collection = get_resume_collection()
-    
-    # Check if resume exists and belongs to user
-    existing_resume = await resume_collection.find_one({
-        "_id": object_id,
-        "user_id": current_user.id
-    })
-    
-    if not existing_resume:
+    # With If-Match, the update only applies to the revision the client last saw
+    revisions = if_match_revisions(if_match, object_id) if if_match else None
+    if revisions == []:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Resume was modified by someone else; reload it and retry"
         )
     
-    # Check if version name is being changed and if it conflicts with other resumes
-    update_data = resume_update.dict(exclude_unset=True)
-    
-    if 'version_name' in update_data and update_data['version_name'] != existing_resume.get('version_name'):
-        # Check if new version name already exists for this user (excluding current resume)
-        existing_with_same_name = await resume_collection.find_one({
-            "user_id": current_user.id,
-            "version_name": update_data['version_name'],
-            "_id": {"$ne": object_id}  # Exclude current resume
-        })
-        
-        if existing_with_same_name:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Version name already exists for this user"
-            )
-    
-    update_data["updated_at"] = datetime.utcnow()
-    
-    # Update resume
-    result = await resume_collection.update_one(
-        {"_id": object_id},
-        {"$set": update_data}
-    )
-    
-    if result.modified_count == 0:
+    # Ownership check, duplicate-name check, revision check, update and re-read in one round trip
+    try:
+        updated_resume = await resume_store.update_resume(
+            current_user.id, object_id, resume_update.model_dump(exclude_unset=True), revisions
+        )
+    except DuplicateVersionName:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No changes made or resume not found"
+            detail="Version name already exists for this user"
+        )
+    except RevisionMismatch:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Resume was modified by someone else; reload it and retry"
         )
     
-    # Get updated resume
-    updated_resume = await resume_collection.find_one({"_id": object_id})
+    if not updated_resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
     
     # Log activity
     background_tasks.add_task(
         log_activity, 
         str(current_user.id), 
         "updated", 
-        f"Updated resume version: {existing_resume.get('version_name', 'Untitled')}",
+        f"Updated resume version: {updated_resume.get('version_name', 'Untitled')}",
         resume_id
     )
+    background_tasks.add_task(schedule_prerender, updated_resume)
+    background_tasks.add_task(refresh_shares, updated_resume)
     
-    return ResumeResponse(**updated_resume)
+    return MongoJSONResponse(project(updated_resume, ResumeResponse), headers=revalidate_headers(resume_etag(updated_resume)))
 
 @router.delete("/{resume_id}")
 async def delete_resume(
@@ -178,13 +233,8 @@ async def delete_resume(
     background_tasks: BackgroundTasks,
     current_user: UserInDB = Depends(get_current_active_user)
 ):
-    resume_collection = get_resume_collection()
-    
-    # Check if resume exists and belongs to user
-    existing_resume = await resume_collection.find_one({
-        "_id": ObjectId(resume_id),
-        "user_id": current_user.id
-    })
+    # Delete and return the document in one round trip
+    existing_resume = await resume_store.delete_resume(current_user.id, ObjectId(resume_id))
     
     if not existing_resume:
         raise HTTPException(
@@ -192,15 +242,6 @@ async def delete_resume(
             detail="Resume not found"
         )
     
-    # Delete resume
-    result = await resume_collection.delete_one({"_id": ObjectId(resume_id)})
-    
-    if result.deleted_count == 0:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Resume not found"
-        )
-    
     # Log activity
     background_tasks.add_task(
         log_activity, 
@@ -209,6 +250,7 @@ async def delete_resume(
         f"Deleted resume version: {existing_resume.get('version_name', 'Untitled')}",
         resume_id
     )
+    background_tasks.add_task(revoke_shares, ObjectId(resume_id))
     
     return {"message": "Resume deleted successfully"}
 
@@ -217,8 +259,16 @@ async def delete_resume(
 async def download_resume(
     resume_id: str,
     background_tasks: BackgroundTasks,
+    template: str = DEFAULT_TEMPLATE,
+    engine: str = DEFAULT_PDF_ENGINE,
     current_user: UserInDB = Depends(get_current_active_user)
 ):
+    check_template(template)
+    if engine not in PDF_ENGINES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown PDF engine. Available: {', '.join(PDF_ENGINES)}"
+        )
     resume_collection = get_resume_collection()
     
     # Get resume data
@@ -233,792 +283,383 @@ async def download_resume(
             detail="Resume not found"
         )
     
-    # Create a proper PDF using a template
-    pdf_path = f"/tmp/resume_{resume_id}.pdf"
+    # Log activity
+    background_tasks.add_task(
+        log_activity, 
+        str(current_user.id), 
+        "downloaded", 
+        f"Downloaded resume version: {resume['version_name']}",
+        resume_id
+    )
     
-    # Generate HTML content for the resume
-    html_content = generate_resume_html(resume)
+    filename = f"{resume['version_name']}.pdf"
+    if engine == "lite":
+        # Text-only single column, written in-process in milliseconds
+        pdf_bytes = await asyncio.to_thread(render_lite_pdf, resume)
+        return await pdf_response(pdf_bytes, filename, background_tasks)
+    
+    # Serve straight from the render cache when this exact content was rendered before
+    cache_key = pdf_cache_key(resume, template)
+    cached_path = pdf_cache.get(cache_key)
+    
+    if cached_path is not None:
+        return FileResponse(
+            cached_path, 
+            media_type='application/pdf',
+            filename=filename
+        )
     
-    # Convert HTML to PDF using pdfkit
-    config = pdfkit.configuration(wkhtmltopdf=os.getenv('wkhtmltopdf', '/usr/local/bin/wkhtmltopdf'))
-
-    pdf_path = os.path.join(tempfile.gettempdir(), f"resume_{resume_id}.pdf")
+    # Render in the warm worker pool; concurrent identical downloads share one render
+    try:
+        pdf_bytes, rendered = await render_pdf(resume, template, cache_key)
+    except RenderQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="PDF renderer is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="PDF rendering timed out, please retry shortly"
+        )
     
-    pdfkit.from_string(
-        html_content,
-        pdf_path,
-        options={
-            'enable-local-file-access': None,   # needed if you use local CSS/images
-            'encoding': "UTF-8",
-        },
-        configuration=config
-    )
+    return await pdf_response(pdf_bytes, filename, background_tasks)
 
-    try:
-        pdfkit.from_string(html_content, pdf_path, options={
-            'page-size': 'A4',
-            'margin-top': '0.5in',
-            'margin-right': '0.5in',
-            'margin-bottom': '0.5in',
-            'margin-left': '0.5in',
-            'encoding': "UTF-8",
-            'no-outline': None
-        }, configuration=config)
-    except Exception as e:
-        # Fallback to simple text if PDF generation fails
-        with open(pdf_path, 'w') as f:
-            f.write(f"Resume: {resume['version_name']}\n")
-            f.write(f"Name: {resume['personal_info']['name']}\n")
-            f.write(f"Email: {resume['personal_info']['email']}\n")
-            f.write(f"Phone: {resume['personal_info']['phone']}\n")
-            f.write(f"Address: {resume['personal_info']['address']}\n\n")
-            f.write("Professional Summary:\n")
-            f.write(f"{resume['personal_info']['summary']}\n\n")
-            f.write("Experience:\n")
-            for exp in resume['experience']:
-                f.write(f"{exp['title']} at {exp['company']} ({exp['period']})\n")
-                f.write(f"{exp['description']}\n\n")
-            f.write("Education:\n")
-            for edu in resume['education']:
-                f.write(f"{edu['degree']} at {edu['institution']} ({edu['period']})\n")
-                f.write(f"{edu['description']}\n\n")
-            f.write("Skills:\n")
-            f.write(f"{', '.join(resume['skills'])}\n")
+@router.get("/{resume_id}/export")
+async def export_resume(
+    resume_id: str,
+    background_tasks: BackgroundTasks,
+    export_format: str = Query(..., alias="format"),
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    if export_format not in EXPORTERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown export format. Available: {', '.join(EXPORTERS)}"
+        )
+    resume_collection = get_resume_collection()
+    resume = await resume_collection.find_one({
+        "_id": ObjectId(resume_id),
+        "user_id": current_user.id
+    })
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
     
-    # Log activity
     background_tasks.add_task(
         log_activity, 
         str(current_user.id), 
-        "downloaded", 
-        f"Downloaded resume version: {resume['version_name']}",
+        "exported", 
+        f"Exported resume version: {resume['version_name']} as {export_format}",
         resume_id
     )
     
-    return FileResponse(
-        pdf_path, 
-        media_type='application/pdf',
-        filename=f"{resume['version_name']}.pdf"
+    # Rendered in-process from the stored document and cached per format
+    exporter = EXPORTERS[export_format]
+    return StreamingResponse(
+        stream_export(resume, export_format),
+        media_type=exporter.media_type,
+        headers={"Content-Disposition": content_disposition(f"{resume['version_name']}.{exporter.extension}")}
     )
 
-def generate_resume_html(resume):
-    # Check if we need two-column layout (more than 4 sections with content)
-    has_projects = resume.get('projects') and len(resume['projects']) > 0
-    has_certificates = resume.get('certificates') and len(resume['certificates']) > 0
-    has_achievements = resume.get('achievements') and len(resume['achievements']) > 0
-    has_skills = resume.get('skills') and len(resume['skills']) > 0
-    has_experience = resume.get('experience') and len(resume['experience']) > 0
-    has_education = resume.get('education') and len(resume['education']) > 0
-    has_links = resume.get('links') and len(resume['links']) > 0
-    has_summary = resume.get('personal_info') and resume['personal_info'].get('summary')
+@router.get("/{resume_id}/thumbnail")
+async def get_resume_thumbnail(
+    resume_id: str,
+    v: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    resume_collection = get_resume_collection()
+    query = {
+        "_id": ObjectId(resume_id),
+        "user_id": current_user.id
+    }
+    # The key only needs _id and revision; the full document is read only to render a missing thumbnail
+    resume = await resume_collection.find_one(query, {"revision": 1})
     
-    section_count = [
-        has_projects, 
-        has_certificates, 
-        has_achievements, 
-        has_skills, 
-        has_experience, 
-        has_education, 
-        has_links, 
-        has_summary
-    ].count(True)
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
     
-    use_two_columns = section_count > 4
+    # v may be the listing's thumbnail_key or the ETag as sent, quotes included
+    if v is not None:
+        v = v.strip().removeprefix("W/").strip('"')
     
-    # Generate contact info HTML
-    contact_info_html = ""
-    if resume['personal_info'].get('email'):
-        contact_info_html += f"""
-            <div class="contact-item">
-                <span>{resume['personal_info']['email']}</span>
-            </div>
-        """
-    if resume['personal_info'].get('phone'):
-        contact_info_html += f"""
-            <div class="contact-item">
-                <span>{resume['personal_info']['phone']}</span>
-            </div>
-        """
-    if resume['personal_info'].get('address'):
-        contact_info_html += f"""
-            <div class="contact-item">
-                <span>{resume['personal_info']['address']}</span>
-            </div>
-        """
-    if has_links:
-        links_html = ""
-        for i, link in enumerate(resume['links']):
-            links_html += f"""
-                <a href="{link['url']}" target="_blank" rel="noopener noreferrer" class="link-platform">
-                    {link['platform']}{', ' if i < len(resume['links']) - 1 else ''}
-                </a>
-            """
-        contact_info_html += f"""
-            <div class="contact-item links-inline">
-                {links_html}
-            </div>
-        """
+    def thumbnail_headers(key: str) -> dict:
+        return {
+            # The key names this version and the render options, so it doubles as the ETag
+            "ETag": f'"{key}"',
+            # A URL carrying the current version never changes; the bare URL is revalidated
+            "Cache-Control": "private, max-age=31536000, immutable" if v == key else "private, no-cache",
+        }
     
-    # Generate left column HTML
-    left_column_html = ""
-    if has_summary:
-        left_column_html += f"""
-            <div class="resume-section">
-                <div class="section-header">
-                    <h2>Professional Summary</h2>
-                </div>
-                <div class="section-content">
-                    <p>{resume['personal_info']['summary']}</p>
-                </div>
-            </div>
-        """
+    key = thumbnail_key(resume)
+    headers = thumbnail_headers(key)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
     
-    if has_experience:
-        experience_html = ""
-        for exp in resume['experience']:
-            period_html = f"<span class='date'>{exp['period']}</span>" if exp.get('period') else ""
-            company_html = f"<span class='company'>{exp['company']}</span>" if exp.get('company') else ""
-            description_html = f"""
-                <div class="item-description">
-                    <p>{exp['description']}</p>
-                </div>
-            """ if exp.get('description') else ""
-            
-            experience_html += f"""
-                <div class="experience-item">
-                    <div class="item-header">
-                        <h3>{exp['title']}</h3>
-                        <div class="date-location">
-                            {period_html}
-                            {company_html}
-                        </div>
-                    </div>
-                    {description_html}
-                </div>
-            """
-        
-        left_column_html += f"""
-            <div class="resume-section">
-                <div class="section-header">
-                    <h2>Work Experience</h2>
-                </div>
-                <div class="section-content">
-                    {experience_html}
-                </div>
-            </div>
-        """
+    path = thumbnail_cache.get(key)
+    if path is not None:
+        return FileResponse(path, media_type="image/png", headers=headers)
     
-    if has_projects:
-        projects_html = ""
-        for project in resume['projects']:
-            period_html = f"<span class='date'>{project['period']}</span>" if project.get('period') else ""
-            tech_html = f"<span class='technologies'>{project['technologies']}</span>" if project.get('technologies') else ""
-            description_html = f"""
-                <div class="item-description">
-                    <p>{project['description']}</p>
-                </div>
-            """ if project.get('description') else ""
-            
-            link_html = ""
-            if project.get('link'):
-                link_html = f"""
-                    <div class="project-link">
-                        <a href="{project['link']}" target="_blank" rel="noopener noreferrer">
-                            View Project
-                        </a>
-                    </div>
-                """
-            
-            projects_html += f"""
-                <div class="project-item">
-                    <div class="item-header">
-                        <h3>{project['name']}</h3>
-                        <div class="date-location">
-                            {period_html}
-                            {tech_html}
-                        </div>
-                    </div>
-                    {description_html}
-                    {link_html}
-                </div>
-            """
-        
-        left_column_html += f"""
-            <div class="resume-section">
-                <div class="section-header">
-                    <h2>Projects</h2>
-                </div>
-                <div class="section-content">
-                    {projects_html}
-                </div>
-            </div>
-        """
+    resume = await resume_collection.find_one(query)
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    # Saved again since the first read: describe the version actually rendered
+    key = thumbnail_key(resume)
+    headers = thumbnail_headers(key)
     
-    if has_skills:
-        skills_html = "".join([f"<div class='skill-tag'>{skill}</div>" for skill in resume['skills']])
-        left_column_html += f"""
-            <div class="resume-section">
-                <div class="section-header">
-                    <h2>Skills</h2>
-                </div>
-                <div class="section-content">
-                    <div class="skills-container">
-                        {skills_html}
-                    </div>
-                </div>
-            </div>
-        """
+    try:
+        path = await generate_thumbnail(resume, key)
+    except RenderQueueFull as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Thumbnail renderer is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Thumbnail rendering timed out, please retry shortly"
+        )
+    except ThumbnailError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Thumbnail could not be rendered"
+        )
     
-    # Generate right column HTML
-    right_column_html = ""
-    if has_education:
-        education_html = ""
-        for edu in resume['education']:
-            period_html = f"<span class='date'>{edu['period']}</span>" if edu.get('period') else ""
-            institution_html = f"<span class='institution'>{edu['institution']}</span>" if edu.get('institution') else ""
-            description_html = f"""
-                <div class="item-description">
-                    <p>{edu['description']}</p>
-                </div>
-            """ if edu.get('description') else ""
-            
-            education_html += f"""
-                <div class="education-item">
-                    <div class="item-header">
-                        <h3>{edu['degree']}</h3>
-                        <div class="date-location">
-                            {period_html}
-                            {institution_html}
-                        </div>
-                    </div>
-                    {description_html}
-                </div>
-            """
-        
-        right_column_html += f"""
-            <div class="resume-section">
-                <div class="section-header">
-                    <h2>Education</h2>
-                </div>
-                <div class="section-content">
-                    {education_html}
-                </div>
-            </div>
-        """
+    return FileResponse(path, media_type="image/png", headers=headers)
+
+def share_response(share: dict) -> ShareResponse:
+    return ShareResponse(
+        token=share["_id"],
+        resume_id=str(share["resume_id"]),
+        template=share["template"],
+        url=f"/r/{share['_id']}",
+        created_at=share["created_at"]
+    )
+
+@router.post("/{resume_id}/shares", response_model=ShareResponse, status_code=status.HTTP_201_CREATED)
+async def create_share(
+    resume_id: str,
+    share_request: ShareCreate,
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    check_template(share_request.template)
+    resume_collection = get_resume_collection()
+    resume = await resume_collection.find_one({
+        "_id": ObjectId(resume_id),
+        "user_id": current_user.id
+    })
     
-    if has_certificates:
-        certificates_html = ""
-        for cert in resume['certificates']:
-            date_html = f"<span class='date'>{cert['date']}</span>" if cert.get('date') else ""
-            issuer_html = f"<span class='issuer'>{cert['issuer']}</span>" if cert.get('issuer') else ""
-            
-            link_html = ""
-            if cert.get('credentialLink'):
-                link_html = f"""
-                    <div class="certificate-link">
-                        <a href="{cert['credentialLink']}" target="_blank" rel="noopener noreferrer">
-                            Verify Credential
-                        </a>
-                    </div>
-                """
-            
-            certificates_html += f"""
-                <div class="certificate-item">
-                    <div class="item-header">
-                        <h3>{cert['name']}</h3>
-                        <div class="date-location">
-                            {date_html}
-                            {issuer_html}
-                        </div>
-                    </div>
-                    {link_html}
-                </div>
-            """
-        
-        right_column_html += f"""
-            <div class="resume-section">
-                <div class="section-header">
-                    <h2>Certifications</h2>
-                </div>
-                <div class="section-content">
-                    {certificates_html}
-                </div>
-            </div>
-        """
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
     
-    if has_achievements:
-        achievements_html = ""
-        for achievement in resume['achievements']:
-            date_html = f"<span class='date'>{achievement['date']}</span>" if achievement.get('date') else ""
-            description_html = f"""
-                <div class="item-description">
-                    <p>{achievement['description']}</p>
-                </div>
-            """ if achievement.get('description') else ""
-            
-            achievements_html += f"""
-                <div class="achievement-item">
-                    <div class="item-header">
-                        <h3>{achievement['title']}</h3>
-                        {date_html}
-                    </div>
-                    {description_html}
-                </div>
-            """
-        
-        right_column_html += f"""
-            <div class="resume-section">
-                <div class="section-header">
-                    <h2>Achievements</h2>
-                </div>
-                <div class="section-content">
-                    {achievements_html}
-                </div>
-            </div>
-        """
+    share = {
+        "_id": new_share_token(),
+        "user_id": current_user.id,
+        "resume_id": resume["_id"],
+        "template": share_request.template,
+        "created_at": datetime.utcnow()
+    }
+    share_collection = get_share_collection()
+    await share_collection.insert_one(share)
+    
+    # Publish the first snapshot before handing out the link
+    try:
+        await publish_share(share["_id"], resume, share["template"])
+    except Exception:
+        await share_collection.delete_one({"_id": share["_id"]})
+        await revoke_share(share["_id"])
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not publish the shared resume, please retry shortly"
+        )
     
-    return f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{resume.get('version_name', 'Resume')}</title>
-    <style>
-        /* components/ResumePreview.css */
-        .resume-preview {{
-        display: flex;
-        justify-content: center;
-        }}
-
-        .resume-a4-template {{
-        background: white;
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-        color: #2d3748;
-        }}
-
-        /* Header Section */
-        .resume-header {{
-        border-bottom: 2px solid #4361ee;
-        padding-bottom: 1rem;
-        margin-bottom: 1.5rem;
-        }}
-
-        .name-title {{
-        text-align: center;
-        margin-bottom: 0.75rem;
-        }}
-
-        .name-title h1 {{
-        font-size: 28px;
-        font-weight: 700;
-        color: #2d3748;
-        margin: 0 0 0.25rem 0;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-        }}
-
-        .professional-title {{
-        font-size: 16px;
-        color: #4361ee;
-        font-weight: 500;
-        margin: 0;
-        font-style: italic;
-        }}
-
-        .contact-info {{
-        display: flex;
-        justify-content: center;
-        flex-wrap: wrap;
-        gap: 1rem;
-        font-size: 14px;
-        }}
-
-        .contact-item {{
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-        }}
-
-        .contact-item i {{
-        color: #4361ee;
-        width: 16px;
-        }}
-
-        /* Content Sections */
-        .resume-content {{
-        padding-top: 0.5rem;
-        display: block;
-        }}
-
-        .resume-content.two-columns {{
-        display: grid;
-        grid-template-columns: 1fr 1fr;
-        gap: 2rem;
-        }}
-
-        .content-column {{
-        display: flex;
-        flex-direction: column;
-        gap: 1.25rem;
-        }}
-
-        .resume-section {{
-        page-break-inside: avoid;
-        }}
-
-        .section-header {{
-        display: flex;
-        align-items: center;
-        margin-bottom: 0.75rem;
-        border-bottom: 1px solid #e2e8f0;
-        padding-bottom: 0.5rem;
-        }}
-
-        .section-icon {{
-        color: #4361ee;
-        margin-right: 0.75rem;
-        font-size: 16px;
-        }}
-
-        .section-header h2 {{
-        font-size: 18px;
-        font-weight: 600;
-        color: #2d3748;
-        margin: 0;
-        text-transform: uppercase;
-        letter-spacing: 0.5px;
-        }}
-
-        .section-content {{
-        padding-left: 1.75rem;
-        }}
-        /* Experience & Education Items */
-        .experience-item,
-        .education-item,
-        .project-item,
-        .certificate-item,
-        .achievement-item {{
-        margin-bottom: 1rem;
-        page-break-inside: avoid;
-        }}
-
-        .item-header {{
-        display: flex;
-        justify-content: space-between;
-        align-items: flex-start;
-        margin-bottom: 0.25rem;
-        }}
+    return share_response(share)
 
-        .item-header h3 {{
-        font-size: 16px;
-        font-weight: 600;
-        color: #2d3748;
-        margin: 0;
-        flex: 2;
-        }}
-
-        .date-location {{
-        display: flex;
-        flex-direction: column;
-        align-items: flex-end;
-        flex: 1;
-        font-size: 14px;
-        text-align: right;
-        }}
-
-        .date {{
-        color: #4361ee;
-        font-weight: 500;
-        }}
-
-        .company,
-        .institution,
-        .technologies,
-        .issuer {{
-        color: #4a5568;
-        font-style: italic;
-        font-size: 13px;
-        }}
-
-        .item-description {{
-        margin-top: 0.25rem;
-        }}
-
-        .item-description p {{
-        margin: 0;
-        font-size: 14px;
-        color: #4a5568;
-        text-align: justify;
-        }}
-
-        /* Project Links */
-        .project-link,
-        .certificate-link {{
-        margin-top: 0.5rem;
-        font-size: 13px;
-        }}
-
-        .project-link a,
-        .certificate-link a {{
-        color: #4361ee;
-        text-decoration: none;
-        }}
-
-        .project-link a:hover,
-        .certificate-link a:hover {{
-        text-decoration: underline;
-        }}
-
-        .project-link i,
-        .certificate-link i {{
-        margin-right: 0.25rem;
-        font-size: 12px;
-        }}
-
-        /* Skills Section */
-        .skills-container {{
-        display: flex;
-        flex-wrap: wrap;
-        gap: 0.5rem;
-        }}
-
-        .skill-tag {{
-        background: #e0e7ff;
-        color: #4338ca;
-        padding: 0.35rem 0.75rem;
-        border-radius: 16px;
-        font-size: 13px;
-        font-weight: 500;
-        }}
-
-        /* Links Section */
-        .links-container {{
-        display: flex;
-        flex-direction: column;
-        gap: 0.5rem;
-        }}
-
-        .link-item {{
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-        }}
-
-        .link-item a {{
-        color: #4361ee;
-        text-decoration: none;
-        font-size: 14px;
-        }}
-
-        .link-item a:hover {{
-        text-decoration: underline;
-        }}
-
-        .link-item i {{
-        font-size: 12px;
-        color: #4361ee;
-        }}
-
-        .links-inline a {{
-        margin-left: 5px;
-        text-decoration: none;
-        color: #0073e6;
-        }}
+@router.get("/{resume_id}/shares", response_model=List[ShareResponse])
+async def list_shares(
+    resume_id: str,
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    share_collection = get_share_collection()
+    shares = await share_collection.find({
+        "resume_id": ObjectId(resume_id),
+        "user_id": current_user.id
+    }).to_list(100)
+    return [share_response(share) for share in shares]
 
-        .links-inline a:hover {{
-        text-decoration: underline;
-        }}
+@router.delete("/{resume_id}/shares/{token}")
+async def delete_share(
+    resume_id: str,
+    token: str,
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    share_collection = get_share_collection()
+    result = await share_collection.delete_one({
+        "_id": token,
+        "resume_id": ObjectId(resume_id),
+        "user_id": current_user.id
+    })
+    
+    if result.deleted_count == 0:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Share not found"
+        )
+    
+    await revoke_share(token)
+    return {"message": "Share revoked successfully"}
 
-        .resume-a4-template {{
-            width: 100%;
-            min-height: auto;
-        }}
-        
-        .resume-content.two-columns {{
-            grid-template-columns: 1fr;
-            gap: 1.5rem;
-        }}
-        
-        .item-header {{
-            flex-direction: column;
-            align-items: flex-start;
-        }}
-        
-        .date-location {{
-            align-items: flex-start;
-            text-align: left;
-            margin-top: 0.25rem;
-        }}
-        
-        .contact-info {{
-            flex-direction: column;
-            align-items: center;
-            gap: 0.5rem;
-        }}
-        
-        /* Print Styles for PDF Export */
-        @media print {{
-        .resume-preview {{
-            padding: 0;
-            background: white;
-        }}
-        
-        .resume-a4-template {{
-            width: 100%;
-            height: 100%;
-            box-shadow: none;
-            padding: 15mm;
-            margin: 0;
-        }}
-        
-        body, html {{
-            width: 210mm;
-            height: 297mm;
-            margin: 0;
-            padding: 0;
-        }}
-        
-        .resume-content.two-columns {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 1.5rem;
-        }}
-        
-        /* Ensure no page breaks inside important elements */
-        .resume-section,
-        .experience-item,
-        .education-item,
-        .project-item,
-        .certificate-item,
-        .achievement-item {{
-            page-break-inside: avoid;
-        }}
-        
-        /* Control page breaks */
-        .resume-section:not(:first-child) {{
-            page-break-before: avoid;
-        }}
-        }}
+@router.post("/export")
+async def export_resumes(
+    export_request: ResumeExportRequest,
+    background_tasks: BackgroundTasks,
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    check_template(export_request.template)
+    query = {"user_id": current_user.id}
+    if export_request.resume_ids != "all":
+        try:
+            query["_id"] = {"$in": [ObjectId(resume_id) for resume_id in export_request.resume_ids]}
+        except InvalidId:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid resume ID format"
+            )
+    
+    # One round trip for every requested version
+    resume_collection = get_resume_collection()
+    resumes = await resume_collection.find(query).to_list(EXPORT_MAX_RESUMES + 1)
+    
+    if not resumes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No resumes found"
+        )
+    if len(resumes) > EXPORT_MAX_RESUMES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {EXPORT_MAX_RESUMES} resumes can be exported at once"
+        )
+    
+    background_tasks.add_task(
+        log_activity, 
+        str(current_user.id), 
+        "exported", 
+        f"Exported {len(resumes)} resume version(s)"
+    )
+    
+    return StreamingResponse(
+        stream_resume_zip(resumes, export_request.template),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition("resumes.zip")}
+    )
 
-        /* Responsive adjustments for screen display */
-        @media screen and (max-width: 992px) {{
-        .resume-a4-template {{
-            width: 100%;
-            min-height: auto;
-        }}
-        
-        .resume-content.two-columns {{
-            grid-template-columns: 1fr;
-            gap: 1.5rem;
-        }}
-        
-        .item-header {{
-            flex-direction: column;
-            align-items: flex-start;
-        }}
-        
-        .date-location {{
-            align-items: flex-start;
-            text-align: left;
-            margin-top: 0.25rem;
-        }}
-        
-        .contact-info {{
-            flex-direction: column;
-            align-items: center;
-            gap: 0.5rem;
-        }}
-        }}
+@router.post("/{resume_id}/renders", status_code=status.HTTP_202_ACCEPTED)
+async def create_render_job(
+    resume_id: str,
+    template: str = DEFAULT_TEMPLATE,
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    check_template(template)
+    resume_collection = get_resume_collection()
+    resume = await resume_collection.find_one({
+        "_id": ObjectId(resume_id),
+        "user_id": current_user.id
+    })
+    
+    if not resume:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    try:
+        job = await render_jobs.submit(str(current_user.id), resume, template)
+    except RenderJobQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many queued renders, please retry shortly",
+            headers={"Retry-After": str(render_pool.retry_after)}
+        )
+    
+    return job_status(job)
 
-        /* Fine-tuning for better PDF output */
-        @page {{
-        size: A4;
-        margin: 15mm;
-        }}
+async def get_user_render_job(resume_id: str, job_id: str, current_user: UserInDB) -> dict:
+    job = await render_jobs.store.get(job_id)
+    if not job or job["user_id"] != str(current_user.id) or job["resume_id"] != resume_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Render job not found"
+        )
+    return job
 
-        /* Text formatting utilities */
-        .text-justify {{
-        text-align: justify;
-        }}
+@router.get("/{resume_id}/renders/{job_id}")
+async def get_render_job(
+    resume_id: str,
+    job_id: str,
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    job = await get_user_render_job(resume_id, job_id, current_user)
+    return job_status(job)
 
-        /* Ensure good contrast for printing */
-        @media print {{
-        .resume-a4-template {{
-            color: #000 !important;
-            -webkit-print-color-adjust: exact;
-            print-color-adjust: exact;
-        }}
-        
-        .section-header h2,
-        .item-header h3 {{
-            color: #000 !important;
-        }}
-        
-        .skill-tag {{
-            background: #f0f0f0 !important;
-            color: #000 !important;
-            border: 1px solid #ccc;
-        }}
-        
-        .contact-item i,
-        .section-icon,
-        .project-link i,
-        .certificate-link i,
-        .link-item i {{
-            color: #000 !important;
-        }}
-        
-        .professional-title {{
-            color: #000 !important;
-        }}
-        
-        .date {{
-            color: #000 !important;
-        }}
-        
-        .company,
-        .institution,
-        .technologies,
-        .issuer {{
-            color: #666 !important;
-        }}
-        
-        .project-link a,
-        .certificate-link a,
-        .link-item a {{
-            color: #000 !important;
-            text-decoration: underline;
-        }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="resume-preview">
-        <div class="resume-a4-template">
-            <div class="resume-header">
-                <div class="name-title">
-                    <h1>{resume['personal_info']['name']}</h1>
-                    {resume['personal_info'].get('title') and f'<p class="professional-title">{resume["personal_info"]["title"]}</p>' or ''}
-                </div>
-                
-                <div class="contact-info">
-                    {contact_info_html}
-                </div>
-            </div>
-            
-            <div class="resume-content {'two-columns' if use_two_columns else ''}">
-                <div class="content-column">
-                    {left_column_html}
-                </div>
+@router.get("/{resume_id}/renders/{job_id}/result")
+async def get_render_job_result(
+    resume_id: str,
+    job_id: str,
+    background_tasks: BackgroundTasks,
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    job = await get_user_render_job(resume_id, job_id, current_user)
+    if job["status"] != "done":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Render job is {job['status']}"
+        )
+    
+    pdf_path = pdf_cache.get(job["cache_key"])
+    if pdf_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Rendered PDF has expired, please start a new render"
+        )
+    
+    version_name = job["payload"].get("version_name", "Resume")
+    background_tasks.add_task(
+        log_activity, 
+        str(current_user.id), 
+        "downloaded", 
+        f"Downloaded resume version: {version_name}",
+        resume_id
+    )
+    
+    return FileResponse(
+        pdf_path, 
+        media_type='application/pdf',
+        filename=f"{version_name}.pdf"
+    )
 
-                <div class="content-column">
-                    {right_column_html}
-                </div>
-            </div>
-        </div>
-    </div>
-</body>
-</html>
-    """
+@router.get("/activities/stats")
+async def get_activity_statistics(
+    days: int = Query(7, ge=1, le=ROLLUP_RETENTION_DAYS),
+    current_user: UserInDB = Depends(get_current_active_user)
+):
+    # Served from the daily rollups, never from the raw activity events
+    return await get_activity_stats(current_user.id, days)
 
 @router.get("/activities/recent", response_model=List[ActivityResponse])
 async def get_recent_activities(
@@ -1031,12 +672,12 @@ async def get_recent_activities(
         {"user_id": current_user.id}
     ).sort("created_at", -1).limit(limit).to_list(limit)
     
-    # Convert to response model
-    return [ActivityResponse(
-        id=str(activity["_id"]),
-        user_id=str(activity["user_id"]),
-        activity_type=activity["activity_type"],
-        resume_id=str(activity.get("resume_id")) if activity.get("resume_id") else None,
-        details=activity["details"],
-        created_at=activity["created_at"]
-    ) for activity in activities]
\ No newline at end of file
+    # Same fields as ActivityResponse; ObjectIds are written as strings by the encoder
+    return MongoJSONResponse([{
+        "id": activity["_id"],
+        "user_id": activity["user_id"],
+        "activity_type": activity["activity_type"],
+        "resume_id": activity.get("resume_id"),
+        "details": activity["details"],
+        "created_at": activity["created_at"]
+    } for activity in activities])
\ No newline at end of file
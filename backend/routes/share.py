@@ -0,0 +1,61 @@
+from fastapi import APIRouter, HTTPException, status, Header
+from fastapi.responses import FileResponse, Response
+from typing import Optional
+import asyncio
+from utils.responses import content_disposition, etag_matches
+from utils.share_store import restore_share, share_store, SHARE_MAX_AGE
+
+# Public and unauthenticated: answered from the local snapshot store; MongoDB is only
+# consulted when this node has no snapshot of the token
+router = APIRouter()
+
+MEDIA_TYPES = {"html": "text/html; charset=utf-8", "pdf": "application/pdf"}
+
+async def serve_snapshot(token: str, extension: str, if_none_match: Optional[str]):
+    try:
+        current = await asyncio.to_thread(share_store.current, token)
+    except ValueError:
+        current = None
+    else:
+        if current is None:
+            try:
+                current = await restore_share(token)
+            except Exception as e:
+                print(f"Restoring share {token} failed: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Shared resume is being prepared, please retry shortly",
+                    headers={"Retry-After": "5"}
+                )
+    if current is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Shared resume not found"
+        )
+    
+    etag = f'"{current["version"]}-{extension}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={SHARE_MAX_AGE}",
+        "X-Robots-Tag": "noindex",
+        # User-written HTML on the API origin: no scripts, frames or fetches, only the inline stylesheet
+        "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if extension == "pdf":
+        headers["Content-Disposition"] = content_disposition(f"{current['title'] or 'Resume'}.pdf", "inline")
+    return FileResponse(
+        share_store.path_for(token, current["version"], extension),
+        media_type=MEDIA_TYPES[extension],
+        headers=headers
+    )
+
+@router.get("/r/{token}")
+async def view_shared_resume(token: str, if_none_match: Optional[str] = Header(None)):
+    return await serve_snapshot(token, "html", if_none_match)
+
+@router.get("/r/{token}/pdf")
+async def download_shared_resume(token: str, if_none_match: Optional[str] = Header(None)):
+    return await serve_snapshot(token, "pdf", if_none_match)
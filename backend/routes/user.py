@@ -2,6 +2,7 @@ from fastapi import APIRouter, HTTPException, status, Depends
 from models.user import UserUpdate, UserResponse
 from utils.auth import get_current_active_user
 from utils.database import get_user_collection
+from utils.user_cache import user_cache
 from bson import ObjectId
 from datetime import datetime
 
@@ -38,13 +39,14 @@ async def update_user(
         )
     
     user_collection = get_user_collection()
-    update_data = user_update.dict(exclude_unset=True)
+    update_data = user_update.model_dump(exclude_unset=True)
     update_data["updated_at"] = datetime.utcnow()
     
     result = await user_collection.update_one(
         {"_id": ObjectId(user_id)},
         {"$set": update_data}
     )
+    user_cache.invalidate(user_id)
     
     if result.modified_count == 0:
         raise HTTPException(
@@ -0,0 +1,11 @@
+import os
+import sys
+
+# Settings the app reads at import time; a real .env still wins for anything it sets
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["DB_ROUND_TRIP_HEADER"] = "true"
+# Saves would otherwise schedule thumbnail renders on a pool the tests never start
+os.environ["THUMBNAILS_ENABLED"] = "false"
+
+# Let the tests import the app modules from the backend directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,137 @@
+"""Each resume mutation costs exactly one MongoDB round trip, on the resumes collection.
+
+Needs a MongoDB server; the tests use (and drop) the resume_platform_test database.
+
+    TEST_MONGODB_URI=mongodb://localhost:27017 python -m pytest tests
+"""
+import os
+import pytest
+from bson import ObjectId
+from httpx import ASGITransport, AsyncClient
+from pymongo import MongoClient, monitoring
+from pymongo.errors import PyMongoError
+
+TEST_MONGODB_URI = os.getenv("TEST_MONGODB_URI", "mongodb://localhost:27017")
+TEST_DATABASE = "resume_platform_test"
+
+try:
+    MongoClient(TEST_MONGODB_URI, serverSelectionTimeoutMS=2000).admin.command("ping")
+except PyMongoError:
+    pytest.skip(f"MongoDB is not reachable at {TEST_MONGODB_URI}", allow_module_level=True)
+
+os.environ["MONGODB_URI"] = TEST_MONGODB_URI
+
+class CommandRecorder(monitoring.CommandListener):
+    """Records (command, collection) for every command sent by clients created after registration"""
+
+    def __init__(self):
+        self.commands = []
+
+    def started(self, event):
+        self.commands.append((event.command_name, event.command.get(event.command_name)))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def on(self, collection: str) -> list:
+        return [name for name, target in self.commands if target == collection]
+
+recorder = CommandRecorder()
+monitoring.register(recorder)
+
+from main import app
+from models.user import UserInDB
+from utils import database
+from utils.auth import get_current_active_user
+from utils.indexes import ensure_indexes
+
+USER = UserInDB(email="round-trips@example.com", full_name="Round Trips", hashed_password="x")
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def client():
+    await database.connect_db()
+    database.db = database.client[TEST_DATABASE]
+    # user_version_unique is what turns a duplicate name into a 400
+    await ensure_indexes(database.db)
+    app.dependency_overrides[get_current_active_user] = lambda: USER
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
+        await database.client.drop_database(TEST_DATABASE)
+        await database.close_db()
+
+def resume_body(version_name: str) -> dict:
+    return {
+        "version_name": version_name,
+        "personal_info": {
+            "name": "Round Trips",
+            "email": "round-trips@example.com",
+            "phone": "+1 555 0100",
+            "address": "1 Test Street",
+            "summary": "Keeps database round trips down.",
+        },
+        "skills": ["Python"],
+    }
+
+async def send(client: AsyncClient, method: str, url: str, **kwargs):
+    """Send one request; returns the response and the resumes commands it issued"""
+    recorder.commands.clear()
+    response = await client.request(method, url, **kwargs)
+    # Background tasks (activity log, share refresh) finish before the call returns
+    # and touch other collections only
+    return response, recorder.on("resumes")
+
+def assert_one_round_trip(response, resume_commands: list, command: str):
+    assert response.headers["X-DB-Round-Trips"] == "1"
+    assert resume_commands == [command]
+
+@pytest.mark.anyio
+async def test_create_update_delete_one_round_trip_each(client):
+    response, commands = await send(client, "POST", "/api/resumes/", json=resume_body("Main"))
+    assert response.status_code == 200
+    assert_one_round_trip(response, commands, "insert")
+    resume_id = response.json()["_id"]
+
+    response, commands = await send(client, "PUT", f"/api/resumes/{resume_id}", json={"skills": ["Python", "Go"]})
+    assert response.status_code == 200
+    assert response.json()["skills"] == ["Python", "Go"]
+    assert_one_round_trip(response, commands, "findAndModify")
+
+    response, commands = await send(client, "DELETE", f"/api/resumes/{resume_id}")
+    assert response.status_code == 200
+    assert_one_round_trip(response, commands, "findAndModify")
+
+@pytest.mark.anyio
+async def test_duplicate_version_name_is_rejected_in_one_round_trip(client):
+    response, _ = await send(client, "POST", "/api/resumes/", json=resume_body("Main"))
+    assert response.status_code == 200
+    other_id = (await send(client, "POST", "/api/resumes/", json=resume_body("Other")))[0].json()["_id"]
+
+    response, commands = await send(client, "POST", "/api/resumes/", json=resume_body("Main"))
+    assert response.status_code == 400
+    assert_one_round_trip(response, commands, "insert")
+
+    response, commands = await send(client, "PUT", f"/api/resumes/{other_id}", json={"version_name": "Main"})
+    assert response.status_code == 400
+    assert_one_round_trip(response, commands, "findAndModify")
+
+@pytest.mark.anyio
+async def test_missing_resume_is_404_in_one_round_trip(client):
+    missing_id = str(ObjectId())
+
+    response, commands = await send(client, "PUT", f"/api/resumes/{missing_id}", json={"skills": []})
+    assert response.status_code == 404
+    assert_one_round_trip(response, commands, "findAndModify")
+
+    response, commands = await send(client, "DELETE", f"/api/resumes/{missing_id}")
+    assert response.status_code == 404
+    assert_one_round_trip(response, commands, "findAndModify")
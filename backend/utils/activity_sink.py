@@ -0,0 +1,117 @@
+from collections import deque
+from datetime import datetime
+from typing import Optional
+import asyncio
+import os
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo.errors import BulkWriteError
+from utils.database import get_activity_collection
+from utils.activity_stats import record_rollups
+
+load_dotenv()
+
+ACTIVITY_QUEUE_SIZE = int(os.getenv("ACTIVITY_QUEUE_SIZE", "10000"))
+ACTIVITY_BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))
+ACTIVITY_FLUSH_SECONDS = float(os.getenv("ACTIVITY_FLUSH_SECONDS", "1"))
+
+class ActivitySink:
+    """Buffers activity events in memory and writes them with insert_many in batches"""
+
+    def __init__(self, max_queued: int, batch_size: int, flush_interval: float):
+        self.max_queued = max_queued
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.logged = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.rollup_failed = 0
+        self._queue = deque()
+        self._wakeup = None
+        self._task = None
+        self._running = False
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything still queued; called from lifespan before the database closes"""
+        # Stop by flag rather than cancel, so an in-flight insert_many completes
+        self._running = False
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self._flush_queued()
+
+    def log(self, user_id: str, activity_type: str, details: str, resume_id: Optional[str] = None):
+        """Queue one event without blocking; dropped and counted when the queue is full"""
+        if len(self._queue) >= self.max_queued:
+            self.dropped += 1
+            return
+        self._queue.append({
+            "_id": ObjectId(),
+            "user_id": ObjectId(user_id),
+            "activity_type": activity_type,
+            "resume_id": ObjectId(resume_id) if resume_id else None,
+            "details": details,
+            "created_at": datetime.utcnow(),
+        })
+        self.logged += 1
+        if len(self._queue) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _run(self):
+        while self._running:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            # Cleared after waking, so a batch filled during the flush wakes us straight away
+            self._wakeup.clear()
+            await self._flush_queued()
+
+    async def _flush_queued(self):
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            await self._write(batch)
+
+    async def _write(self, batch: list):
+        self.batches += 1
+        inserted = batch
+        try:
+            # Unordered: one bad document does not hold back the rest of the batch
+            await get_activity_collection().insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            inserted = [event for index, event in enumerate(batch) if index not in failed]
+            self.failed += len(failed)
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Writing {len(batch)} activity events failed: {e}")
+            return
+        self.written += len(inserted)
+        try:
+            # Daily counters for the dashboard, one bulk upsert per batch
+            await record_rollups(inserted)
+        except Exception as e:
+            self.rollup_failed += 1
+            print(f"Updating activity rollups failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "queued": len(self._queue),
+            "max_queued": self.max_queued,
+            "logged": self.logged,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "rollup_failed": self.rollup_failed,
+        }
+
+activity_sink = ActivitySink(ACTIVITY_QUEUE_SIZE, ACTIVITY_BATCH_SIZE, ACTIVITY_FLUSH_SECONDS)
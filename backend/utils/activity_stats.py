@@ -0,0 +1,67 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List
+import asyncio
+import os
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+from utils.database import get_activity_rollup_collection
+
+load_dotenv()
+
+# Raw activity events expire after this many days; the daily rollups outlive them
+ACTIVITY_RETENTION_DAYS = int(os.getenv("ACTIVITY_RETENTION_DAYS", "90"))
+ROLLUP_RETENTION_DAYS = int(os.getenv("ROLLUP_RETENTION_DAYS", "400"))
+
+def _day(moment: datetime) -> datetime:
+    return datetime(moment.year, moment.month, moment.day)
+
+def rollup_updates(events: List[dict]) -> List[UpdateOne]:
+    """$inc upserts for the per-user daily and all-time counters of a batch of events"""
+    daily, totals = Counter(), Counter()
+    for event in events:
+        daily[(event["user_id"], _day(event["created_at"]), event["activity_type"])] += 1
+        totals[(event["user_id"], event["activity_type"])] += 1
+    updates = [
+        UpdateOne(
+            {"_id": f"{user_id}:{day:%Y-%m-%d}"},
+            {"$inc": {f"counts.{activity_type}": count}, "$setOnInsert": {"user_id": user_id, "day": day}},
+            upsert=True
+        )
+        for (user_id, day, activity_type), count in daily.items()
+    ]
+    # The all-time document has no day, so the rollup TTL index never expires it
+    updates += [
+        UpdateOne(
+            {"_id": f"{user_id}:total"},
+            {"$inc": {f"counts.{activity_type}": count}, "$setOnInsert": {"user_id": user_id}},
+            upsert=True
+        )
+        for (user_id, activity_type), count in totals.items()
+    ]
+    return updates
+
+async def record_rollups(events: List[dict]):
+    if events:
+        await get_activity_rollup_collection().bulk_write(rollup_updates(events), ordered=False)
+
+async def get_activity_stats(user_id: ObjectId, days: int) -> dict:
+    """Counts per activity type for the last `days` days (today included), per day and all-time"""
+    rollup_collection = get_activity_rollup_collection()
+    since = _day(datetime.utcnow()) - timedelta(days=days - 1)
+    # Two indexed reads whose cost depends on the window, not on the length of the history
+    daily_docs, total_doc = await asyncio.gather(
+        rollup_collection.find({"user_id": user_id, "day": {"$gte": since}}).sort("day", 1).to_list(days),
+        rollup_collection.find_one({"_id": f"{user_id}:total"}),
+    )
+    window = Counter()
+    for doc in daily_docs:
+        window.update(doc["counts"])
+    return {
+        "since": since,
+        "days": days,
+        "totals": dict(window),
+        "all_time": (total_doc or {}).get("counts", {}),
+        "daily": [{"date": f"{doc['day']:%Y-%m-%d}", "counts": doc["counts"]} for doc in daily_docs],
+    }
@@ -7,6 +7,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from models.user import UserInDB, UserResponse
 from utils.database import get_user_collection
+from utils.user_cache import user_cache
+from utils.password_hasher import password_hasher
 from bson import ObjectId
 
 load_dotenv()
@@ -14,15 +16,20 @@ load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+# Each extra round doubles the cost; hashes made with other rounds are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+# bcrypt is CPU-bound: only ever call pwd_context through password_hasher, never on the event loop
+async def hash_password(password: str) -> str:
+    """Hash off the event loop; raises PasswordHasherBusy when saturated"""
+    return await password_hasher.run(pwd_context.hash, password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def verify_and_update_password(plain_password: str, hashed_password: str):
+    """(valid, new_hash) off the event loop; new_hash is set when the stored hash is outdated"""
+    return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -48,11 +55,18 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
+    # A hit skips MongoDB entirely; update_user invalidates the entry
+    cached_user = user_cache.get(user_id)
+    if cached_user is not None:
+        return cached_user
+    
     user_collection = get_user_collection()
     user = await user_collection.find_one({"_id": ObjectId(user_id)})
     if user is None:
         raise credentials_exception
-    return UserInDB(**user)
+    user_in_db = UserInDB(**user)
+    user_cache.put(user_id, user_in_db)
+    return user_in_db
 
 async def get_current_active_user(current_user: UserInDB = Depends(get_current_user)):
     if not current_user.is_active:
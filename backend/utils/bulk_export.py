@@ -0,0 +1,95 @@
+from typing import List
+import asyncio
+import os
+import re
+import zipfile
+from dotenv import load_dotenv
+from utils.pdf_cache import pdf_cache
+from utils.pdf_renderer import pdf_cache_key
+from utils.pdf_service import render_pdf
+from utils.render_pool import RenderQueueFull
+
+load_dotenv()
+
+EXPORT_PARALLELISM = int(os.getenv("EXPORT_PARALLELISM", "2"))
+EXPORT_MAX_RESUMES = int(os.getenv("EXPORT_MAX_RESUMES", "200"))
+
+class _ChunkBuffer:
+    """Write-only, non-seekable sink; zipfile then streams entries with data descriptors"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+async def _render(resume: dict, template: str):
+    """Return (pdf bytes, rendered) from the cache or the render pool"""
+    cache_key = pdf_cache_key(resume, template)
+    cached_path = pdf_cache.get(cache_key)
+    if cached_path is not None:
+        try:
+            return await asyncio.to_thread(_read_file, cached_path), True
+        except OSError:
+            pass  # Evicted between lookup and read; render it again
+    while True:
+        try:
+            return await render_pdf(resume, template, cache_key)
+        except RenderQueueFull as e:
+            await asyncio.sleep(e.retry_after)
+
+def _entry_name(version_name: str, extension: str, used: set) -> str:
+    base = re.sub(r'[\\/:*?"<>|\x00-\x1f]+', "_", version_name or "").strip(" .") or "resume"
+    name, counter = f"{base}.{extension}", 2
+    while name in used:
+        name, counter = f"{base} ({counter}).{extension}", counter + 1
+    used.add(name)
+    return name
+
+async def stream_resume_zip(resumes: List[dict], template: str, parallelism: int = EXPORT_PARALLELISM):
+    """Render resumes concurrently and yield a ZIP archive entry by entry as renders finish"""
+    pending = list(resumes)
+    # Bounded so finished PDFs wait for a slow client instead of piling up in memory
+    finished = asyncio.Queue(maxsize=parallelism)
+
+    async def worker():
+        while pending:
+            resume = pending.pop()
+            try:
+                await finished.put((resume, *(await _render(resume, template)), None))
+            except Exception as e:
+                await finished.put((resume, None, False, str(e)))
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(parallelism, len(resumes)))]
+    buffer = _ChunkBuffer()
+    archive = zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED)
+    used_names, errors = set(), []
+    try:
+        for _ in range(len(resumes)):
+            resume, data, _, error = await finished.get()
+            version_name = resume.get("version_name", "")
+            if error is not None:
+                errors.append(f"{version_name}: {error}")
+                continue
+            archive.writestr(_entry_name(version_name, "pdf", used_names), data)
+            yield buffer.drain()
+        if errors:
+            archive.writestr(_entry_name("errors", "txt", used_names), "\n".join(errors))
+        archive.close()
+        yield buffer.drain()
+    finally:
+        for task in workers:
+            task.cancel()
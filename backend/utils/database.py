@@ -2,6 +2,7 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
 import os
 from dotenv import load_dotenv
+from utils.db_metrics import round_trip_listener
 
 load_dotenv()
 
@@ -15,7 +16,7 @@ async def connect_db():
     if not MONGODB_URI:
         raise ValueError("MONGODB_URI environment variable is not set")
     
-    client = AsyncIOMotorClient(MONGODB_URI)
+    client = AsyncIOMotorClient(MONGODB_URI, event_listeners=[round_trip_listener])
     db = client.resume_platform
     print("Connected to MongoDB")
 
@@ -36,4 +37,13 @@ def get_resume_collection():
     return get_db().resumes
 
 def get_activity_collection():
-    return get_db().activities
\ No newline at end of file
+    return get_db().activities
+
+def get_activity_rollup_collection():
+    return get_db().activity_daily
+
+def get_share_collection():
+    return get_db().shares
+
+def get_session_collection():
+    return get_db().sessions
\ No newline at end of file
@@ -0,0 +1,35 @@
+from contextvars import ContextVar
+from pymongo import monitoring
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Adds X-DB-Round-Trips to every response; meant for tests and profiling
+DB_ROUND_TRIP_HEADER = os.getenv("DB_ROUND_TRIP_HEADER", "false").lower() in ("1", "true", "yes")
+
+# Per-request counter; Motor copies the context into its executor threads, so the
+# listener sees the same list object that the request set
+_round_trips = ContextVar("db_round_trips", default=None)
+
+class RoundTripCounter(monitoring.CommandListener):
+    """Counts MongoDB commands sent while handling the current request"""
+
+    def started(self, event):
+        counter = _round_trips.get()
+        if counter is not None:
+            counter[0] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+round_trip_listener = RoundTripCounter()
+
+def track_round_trips() -> list:
+    """Start counting for the current context; the count is read from the returned list"""
+    counter = [0]
+    _round_trips.set(counter)
+    return counter
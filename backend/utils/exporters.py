@@ -0,0 +1,359 @@
+from typing import Callable, Iterator, NamedTuple, Optional
+from xml.sax.saxutils import escape
+import io
+import json
+import os
+import re
+import zipfile
+from dotenv import load_dotenv
+from utils.lru import LRUCache
+
+load_dotenv()
+
+# Byte budget of each format's in-memory cache
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+class Exporter(NamedTuple):
+    render: Callable[[dict], Iterator[bytes]]
+    media_type: str
+    extension: str
+
+class UnknownFormat(ValueError):
+    pass
+
+# Format name -> exporter; filled in by @exporter below
+EXPORTERS = {}
+
+def exporter(name: str, media_type: str, extension: str):
+    """Register a generator function that yields the document in chunks"""
+    def register(render):
+        EXPORTERS[name] = Exporter(render, media_type, extension)
+        return render
+    return register
+
+def get_exporter(name: str) -> Exporter:
+    try:
+        return EXPORTERS[name]
+    except KeyError:
+        raise UnknownFormat(f"Unknown export format: {name}")
+
+def export_cache_key(resume: dict) -> str:
+    # Every update bumps the revision, so (id, revision) names one version without hashing it
+    return f"{resume['_id']}.{resume.get('revision', 0)}"
+
+# Format name -> in-memory LRU of its exported documents, created on first use
+_caches = {}
+
+def get_export_cache(name: str) -> LRUCache:
+    cache = _caches.get(name)
+    if cache is None:
+        cache = _caches.setdefault(name, LRUCache(EXPORT_CACHE_MAX_BYTES, size_of=len, unit="bytes"))
+    return cache
+
+def export_cache_stats() -> dict:
+    return {name: get_export_cache(name).stats() for name in EXPORTERS}
+
+def stream_export(resume: dict, name: str) -> Iterator[bytes]:
+    """Yield the exported document, served from or added to the format's cache"""
+    render = get_exporter(name).render
+    cache, key = get_export_cache(name), export_cache_key(resume)
+    cached = cache.get(key)
+    if cached is not None:
+        yield cached
+        return
+    chunks = []
+    for chunk in render(resume):
+        chunks.append(chunk)
+        yield chunk
+    # Only reached when the client read the whole document
+    cache.put(key, b"".join(chunks))
+
+def _info(resume: dict) -> dict:
+    return resume.get('personal_info') or {}
+
+def _join(*parts, separator: str = " | ") -> str:
+    return separator.join(str(part) for part in parts if part)
+
+@exporter("text", "text/plain; charset=utf-8", "txt")
+def render_text(resume: dict) -> Iterator[bytes]:
+    """Plain text with one block per section, for ATS uploads and pasting into forms"""
+    info = _info(resume)
+
+    def block(heading: str, lines: list) -> str:
+        return f"{heading.upper()}\n{'-' * len(heading)}\n" + "\n".join(lines) + "\n\n"
+
+    header = [info.get('name') or resume.get('version_name') or "Resume"]
+    header += [value for value in (
+        info.get('title'),
+        _join(info.get('email'), info.get('phone'), info.get('address')),
+        _join(*(f"{link.get('platform')}: {link.get('url')}" for link in resume.get('links') or [])),
+    ) if value]
+    yield ("\n".join(header) + "\n\n").encode("utf-8")
+    if info.get('summary'):
+        yield block("Professional Summary", [info['summary']]).encode("utf-8")
+
+    def entries(heading, items, title, meta):
+        if not items:
+            return
+        lines = []
+        for item in items:
+            lines.append(_join(*(item.get(key) for key in title), separator=", "))
+            if _join(*(item.get(key) for key in meta)):
+                lines.append(_join(*(item.get(key) for key in meta)))
+            if item.get('description'):
+                lines.append(str(item['description']))
+            lines.append("")
+        yield block(heading, lines[:-1]).encode("utf-8")
+
+    yield from entries("Work Experience", resume.get('experience'), ("title", "company"), ("period",))
+    yield from entries("Projects", resume.get('projects'), ("name",), ("period", "technologies", "link"))
+    if resume.get('skills'):
+        yield block("Skills", [", ".join(resume['skills'])]).encode("utf-8")
+    yield from entries("Education", resume.get('education'), ("degree", "institution"), ("period",))
+    yield from entries("Certificates", resume.get('certificates'), ("name",), ("issuer", "date"))
+    yield from entries("Achievements", resume.get('achievements'), ("title",), ("date",))
+
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>#|])")
+
+def _md(value) -> str:
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", str(value))
+
+@exporter("markdown", "text/markdown; charset=utf-8", "md")
+def render_markdown(resume: dict) -> Iterator[bytes]:
+    info = _info(resume)
+    lines = [f"# {_md(info.get('name') or resume.get('version_name') or 'Resume')}", ""]
+    if info.get('title'):
+        lines += [f"**{_md(info['title'])}**", ""]
+    contact = _join(*(_md(info.get(key)) for key in ("email", "phone", "address") if info.get(key)))
+    if contact:
+        lines += [contact, ""]
+    links = [f"[{_md(link.get('platform'))}](<{link.get('url')}>)" for link in resume.get('links') or []]
+    if links:
+        lines += [" · ".join(links), ""]
+    yield ("\n".join(lines) + "\n").encode("utf-8")
+
+    if info.get('summary'):
+        yield f"## Professional Summary\n\n{_md(info['summary'])}\n\n".encode("utf-8")
+
+    def entries(heading, items, title, meta):
+        if not items:
+            return
+        parts = [f"## {heading}\n"]
+        for item in items:
+            parts.append(f"### {_join(*(_md(item[key]) for key in title if item.get(key)), separator=' — ')}\n")
+            meta_line = _join(*(_md(item[key]) for key in meta if item.get(key)))
+            if meta_line:
+                parts.append(f"*{meta_line}*\n")
+            if item.get('description'):
+                parts.append(f"{_md(item['description'])}\n")
+        yield ("\n".join(parts) + "\n").encode("utf-8")
+
+    yield from entries("Work Experience", resume.get('experience'), ("title", "company"), ("period",))
+    yield from entries("Projects", resume.get('projects'), ("name",), ("period", "technologies", "link"))
+    if resume.get('skills'):
+        yield ("## Skills\n\n" + "\n".join(f"- {_md(skill)}" for skill in resume['skills']) + "\n\n").encode("utf-8")
+    yield from entries("Education", resume.get('education'), ("degree", "institution"), ("period",))
+    yield from entries("Certificates", resume.get('certificates'), ("name",), ("issuer", "date"))
+    yield from entries("Achievements", resume.get('achievements'), ("title",), ("date",))
+
+_ISO_DATE = re.compile(r"^\d{4}(-\d{2}){0,2}$")
+# "2019 - 2023", "2019 to Present", "2019–2023"; never splits an ISO date such as 2020-05
+_PERIOD_SEPARATOR = re.compile(r"\s+(?:-|–|—|to)\s+|(?<=\d{4})[-–—](?=\d{4}\b|[A-Za-z])")
+
+def _dates(period) -> dict:
+    """startDate/endDate for periods such as '2019 - 2023'; open-ended periods have no endDate"""
+    period = str(period or "").strip()
+    if _ISO_DATE.match(period):
+        return {"startDate": period}
+    parts = _PERIOD_SEPARATOR.split(period, maxsplit=1)
+    if len(parts) != 2:
+        return {}
+    dates = {}
+    if _ISO_DATE.match(parts[0]):
+        dates["startDate"] = parts[0]
+    if _ISO_DATE.match(parts[1]):
+        dates["endDate"] = parts[1]
+    return dates
+
+def _compact(value: dict) -> dict:
+    return {key: item for key, item in value.items() if item not in (None, "", [], {})}
+
+def to_json_resume(resume: dict) -> dict:
+    """Map a stored resume onto the JSON Resume schema (https://jsonresume.org/schema)"""
+    info = _info(resume)
+    return _compact({
+        "basics": _compact({
+            "name": info.get('name'),
+            "label": info.get('title'),
+            "email": info.get('email'),
+            "phone": info.get('phone'),
+            "summary": info.get('summary'),
+            "location": _compact({"address": info.get('address')}),
+            "profiles": [
+                _compact({"network": link.get('platform'), "url": link.get('url')})
+                for link in resume.get('links') or []
+            ],
+        }),
+        "work": [
+            _compact({
+                "name": exp.get('company'),
+                "position": exp.get('title'),
+                "summary": exp.get('description'),
+                **_dates(exp.get('period')),
+            })
+            for exp in resume.get('experience') or []
+        ],
+        "education": [
+            _compact({
+                "institution": edu.get('institution'),
+                "studyType": edu.get('degree'),
+                "courses": [edu['description']] if edu.get('description') else [],
+                **_dates(edu.get('period')),
+            })
+            for edu in resume.get('education') or []
+        ],
+        "skills": [{"name": skill} for skill in resume.get('skills') or []],
+        "projects": [
+            _compact({
+                "name": project.get('name'),
+                "description": project.get('description'),
+                "url": project.get('link'),
+                "keywords": [
+                    keyword.strip() for keyword in str(project.get('technologies') or "").split(",") if keyword.strip()
+                ],
+                **_dates(project.get('period')),
+            })
+            for project in resume.get('projects') or []
+        ],
+        "certificates": [
+            _compact({
+                "name": cert.get('name'),
+                "issuer": cert.get('issuer'),
+                "date": cert.get('date'),
+                "url": cert.get('credentialLink'),
+            })
+            for cert in resume.get('certificates') or []
+        ],
+        "awards": [
+            _compact({
+                "title": achievement.get('title'),
+                "date": achievement.get('date'),
+                "summary": achievement.get('description'),
+            })
+            for achievement in resume.get('achievements') or []
+        ],
+    })
+
+@exporter("json-resume", "application/json", "json")
+def render_json_resume(resume: dict) -> Iterator[bytes]:
+    for chunk in json.JSONEncoder(indent=2, ensure_ascii=False, default=str).iterencode(to_json_resume(resume)):
+        yield chunk.encode("utf-8")
+
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '<Override PartName="/word/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>'
+    '</Types>'
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+_DOCX_DOCUMENT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+def _docx_style(style_id: str, size: int, bold: bool = False, space_before: int = 0) -> str:
+    return (
+        f'<w:style w:type="paragraph" w:styleId="{style_id}"><w:name w:val="{style_id}"/>'
+        f'<w:basedOn w:val="Normal"/><w:pPr><w:spacing w:before="{space_before}" w:after="60"/></w:pPr>'
+        f'<w:rPr>{"<w:b/>" if bold else ""}<w:sz w:val="{size}"/></w:rPr></w:style>'
+    )
+
+_DOCX_STYLES = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:styles {_W}>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/>'
+    '<w:pPr><w:spacing w:after="60"/></w:pPr>'
+    '<w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri"/><w:sz w:val="21"/></w:rPr></w:style>'
+    + _docx_style("Title", 40, bold=True)
+    + _docx_style("Heading1", 24, bold=True, space_before=240)
+    + _docx_style("Heading2", 21, bold=True, space_before=120)
+    + _docx_style("Meta", 18)
+    + '</w:styles>'
+)
+
+def _docx_paragraph(text, style: Optional[str] = None) -> str:
+    properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+    runs = '<w:r><w:br/></w:r>'.join(
+        f'<w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r>' for line in str(text).splitlines() or [""]
+    )
+    return f"<w:p>{properties}{runs}</w:p>"
+
+def _docx_body(resume: dict) -> Iterator[str]:
+    info = _info(resume)
+    yield _docx_paragraph(info.get('name') or resume.get('version_name') or "Resume", "Title")
+    if info.get('title'):
+        yield _docx_paragraph(info['title'])
+    contact = _join(info.get('email'), info.get('phone'), info.get('address'))
+    if contact:
+        yield _docx_paragraph(contact, "Meta")
+    links = _join(*(f"{link.get('platform')}: {link.get('url')}" for link in resume.get('links') or []))
+    if links:
+        yield _docx_paragraph(links, "Meta")
+    if info.get('summary'):
+        yield _docx_paragraph("Professional Summary", "Heading1")
+        yield _docx_paragraph(info['summary'])
+
+    def entries(heading, items, title, meta):
+        if not items:
+            return
+        yield _docx_paragraph(heading, "Heading1")
+        for item in items:
+            yield _docx_paragraph(_join(*(item.get(key) for key in title), separator=", "), "Heading2")
+            if _join(*(item.get(key) for key in meta)):
+                yield _docx_paragraph(_join(*(item.get(key) for key in meta)), "Meta")
+            if item.get('description'):
+                yield _docx_paragraph(item['description'])
+
+    yield from entries("Work Experience", resume.get('experience'), ("title", "company"), ("period",))
+    yield from entries("Projects", resume.get('projects'), ("name",), ("period", "technologies", "link"))
+    if resume.get('skills'):
+        yield _docx_paragraph("Skills", "Heading1")
+        yield _docx_paragraph(", ".join(resume['skills']))
+    yield from entries("Education", resume.get('education'), ("degree", "institution"), ("period",))
+    yield from entries("Certificates", resume.get('certificates'), ("name",), ("issuer", "date"))
+    yield from entries("Achievements", resume.get('achievements'), ("title",), ("date",))
+
+@exporter("docx", "application/vnd.openxmlformats-officedocument.wordprocessingml.document", "docx")
+def render_docx(resume: dict) -> Iterator[bytes]:
+    """Minimal WordprocessingML package written with zipfile; no python-docx needed"""
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:document {_W}><w:body>'
+        + "".join(_docx_body(resume))
+        + '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+        '<w:pgMar w:top="720" w:right="720" w:bottom="720" w:left="720" w:header="0" w:footer="0" w:gutter="0"/>'
+        '</w:sectPr></w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as package:
+        package.writestr("[Content_Types].xml", _DOCX_CONTENT_TYPES)
+        package.writestr("_rels/.rels", _DOCX_RELS)
+        package.writestr("word/_rels/document.xml.rels", _DOCX_DOCUMENT_RELS)
+        package.writestr("word/document.xml", document)
+        package.writestr("word/styles.xml", _DOCX_STYLES)
+    yield buffer.getvalue()
@@ -0,0 +1,18 @@
+import hashlib
+import json
+
+# Document ids are stored as _id; list items are dumped with a fresh ObjectId under id on every save
+ID_FIELDS = ("_id", "id")
+
+def strip_ids(value):
+    """Drop document and item ids so re-saved but unchanged items hash the same"""
+    if isinstance(value, dict):
+        return {k: strip_ids(v) for k, v in value.items() if k not in ID_FIELDS}
+    if isinstance(value, list):
+        return [strip_ids(v) for v in value]
+    return value
+
+def stable_hash(value) -> str:
+    """SHA-256 of a canonical JSON encoding; ObjectId/datetime fall back to str()"""
+    payload = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,151 @@
+"""Declarative MongoDB index registry.
+
+Applied idempotently on startup by main.lifespan. Compare the registry with
+a live database from the backend directory:
+
+    python -m utils.indexes           # report missing, unexpected and unused indexes
+    python -m utils.indexes apply     # create missing indexes
+"""
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+import argparse
+import asyncio
+from utils.activity_stats import ACTIVITY_RETENTION_DAYS, ROLLUP_RETENTION_DAYS
+
+# Collection -> indexes the application queries rely on
+INDEXES = {
+    "users": [
+        # register and login look users up by email
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "resumes": [
+        # Duplicate-name check in create_resume / update_resume; also serves find({"user_id"})
+        IndexModel([("user_id", ASCENDING), ("version_name", ASCENDING)], name="user_version_unique", unique=True),
+        # list_resumes: keyset pages by (updated_at, _id); covers the summary projection,
+        # including the revision behind each item's thumbnail_key
+        IndexModel(
+            [
+                ("user_id", ASCENDING), ("updated_at", DESCENDING), ("_id", DESCENDING),
+                ("version_name", ASCENDING), ("revision", ASCENDING),
+            ],
+            name="user_updated_listing",
+        ),
+    ],
+    "activities": [
+        # get_recent_activities: find({"user_id"}).sort("created_at", -1)
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_recent"),
+        # Raw events expire; counts live on in activity_daily
+        IndexModel([("created_at", ASCENDING)], name="created_ttl", expireAfterSeconds=ACTIVITY_RETENTION_DAYS * 86400),
+    ],
+    "activity_daily": [
+        # get_activity_stats: find({"user_id", "day": {"$gte"}})
+        IndexModel([("user_id", ASCENDING), ("day", ASCENDING)], name="user_day"),
+        # All-time documents have no day and are never expired
+        IndexModel([("day", ASCENDING)], name="day_ttl", expireAfterSeconds=ROLLUP_RETENTION_DAYS * 86400),
+    ],
+    "shares": [
+        # refresh_shares / revoke_shares / list_shares
+        IndexModel([("resume_id", ASCENDING), ("user_id", ASCENDING)], name="resume_shares"),
+    ],
+    "sessions": [
+        # rotate_session / revoke_session look sessions up by the hash of the current refresh token
+        IndexModel([("token", ASCENDING)], name="token_unique", unique=True),
+        # Replay detection in rotate_session
+        IndexModel([("previous", ASCENDING)], name="previous_token"),
+        # list_sessions / delete_session
+        IndexModel([("user_id", ASCENDING), ("last_used_at", DESCENDING)], name="user_sessions"),
+        # Each document is removed once its own expires_at has passed
+        IndexModel([("expires_at", ASCENDING)], name="expires_ttl", expireAfterSeconds=0),
+    ],
+}
+
+# Indexes the application's correctness depends on, not just its speed: startup fails without them
+REQUIRED_INDEXES = {
+    # resume_store has no duplicate-name check of its own; this index is the check
+    ("resumes", "user_version_unique"),
+}
+
+class MissingRequiredIndex(Exception):
+    pass
+
+def _key(spec: dict) -> list:
+    # Indexes created from the mongo shell may store directions as doubles
+    return [
+        (field, int(direction) if isinstance(direction, float) else direction)
+        for field, direction in spec["key"].items()
+    ]
+
+async def ensure_indexes(db):
+    """Create every registered index; existing identical indexes are left untouched.
+
+    Each index is created on its own, so one conflict does not leave the rest of its
+    collection unindexed. Raises MissingRequiredIndex if a REQUIRED_INDEXES entry fails.
+    """
+    failed = []
+    for collection, indexes in INDEXES.items():
+        for index in indexes:
+            name = index.document["name"]
+            try:
+                await db[collection].create_indexes([index])
+            except OperationFailure as e:
+                # e.g. existing duplicates blocking a unique index, or the same keys under another name
+                print(f"Could not create index {collection}.{name}: {e}")
+                if (collection, name) in REQUIRED_INDEXES:
+                    failed.append(f"{collection}.{name}: {e}")
+    if failed:
+        raise MissingRequiredIndex(
+            "Required indexes could not be built, fix the data or conflicting indexes and restart: "
+            + "; ".join(failed)
+        )
+
+async def index_report(db) -> dict:
+    """Per collection: registered indexes that are missing, unregistered ones, and ones never used"""
+    report = {}
+    for collection, indexes in INDEXES.items():
+        existing = {spec["name"]: spec async for spec in db[collection].list_indexes()}
+        existing.pop("_id_", None)
+        declared = {index.document["name"]: index.document for index in indexes}
+        missing = [
+            name for name, spec in declared.items()
+            if name not in existing or _key(existing[name]) != list(spec["key"].items())
+        ]
+        try:
+            # Usage counters reset when mongod restarts
+            usage = {
+                stats["name"]: stats["accesses"]["ops"]
+                async for stats in db[collection].aggregate([{"$indexStats": {}}])
+            }
+        except OperationFailure:
+            usage = {}
+        report[collection] = {
+            "missing": missing,
+            "unregistered": sorted(set(existing) - set(declared)),
+            "unused": sorted(name for name in existing if usage.get(name) == 0),
+        }
+    return report
+
+async def main(command: str):
+    from utils.database import connect_db, close_db, get_db
+
+    await connect_db()
+    failed = False
+    try:
+        if command == "apply":
+            try:
+                await ensure_indexes(get_db())
+            except MissingRequiredIndex as e:
+                print(e)
+                failed = True
+        for collection, result in (await index_report(get_db())).items():
+            print(f"{collection}:")
+            for kind in ("missing", "unregistered", "unused"):
+                print(f"  {kind:<12} {', '.join(result[kind]) or '-'}")
+    finally:
+        await close_db()
+    if failed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare MongoDB indexes with the registry")
+    parser.add_argument("command", nargs="?", choices=("report", "apply"), default="report")
+    asyncio.run(main(parser.parse_args().command))
@@ -0,0 +1,183 @@
+import zlib
+
+# A4 in points, with the same 0.5in margins as the wkhtmltopdf output
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+MARGIN = 36.0
+TEXT_WIDTH = PAGE_WIDTH - 2 * MARGIN
+
+REGULAR, BOLD = "F1", "F2"
+FONTS = {REGULAR: "Helvetica", BOLD: "Helvetica-Bold"}
+
+# Advance widths (1/1000 em) of printable ASCII 32..126 for the standard 14 fonts
+_HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+_WIDTHS = {REGULAR: _HELVETICA_WIDTHS, BOLD: _HELVETICA_BOLD_WIDTHS}
+_DEFAULT_WIDTH = 556
+
+def text_width(text: str, font: str, size: float) -> float:
+    widths = _WIDTHS[font]
+    total = 0
+    for char in text:
+        code = ord(char)
+        total += widths[code - 32] if 32 <= code <= 126 else _DEFAULT_WIDTH
+    return total * size / 1000
+
+def wrap(text: str, font: str, size: float, width: float = TEXT_WIDTH) -> list:
+    """Greedy word wrap by font metrics; words longer than a line are split"""
+    space = text_width(" ", font, size)
+    lines = []
+    for paragraph in str(text).splitlines() or [""]:
+        line, line_width = "", 0.0
+        for word in paragraph.split():
+            word_width = text_width(word, font, size)
+            if line and line_width + space + word_width <= width:
+                line, line_width = f"{line} {word}", line_width + space + word_width
+                continue
+            if line:
+                lines.append(line)
+            while word_width > width:
+                cut = len(word) - 1
+                while cut > 1 and text_width(word[:cut], font, size) > width:
+                    cut -= 1
+                lines.append(word[:cut])
+                word = word[cut:]
+                word_width = text_width(word, font, size)
+            line, line_width = word, word_width
+        lines.append(line)
+    return lines
+
+def _pdf_string(text: str) -> bytes:
+    # The standard fonts use WinAnsiEncoding; anything outside it prints as "?"
+    data = text.encode("cp1252", errors="replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+class _Layout:
+    """Lays out lines top to bottom, starting a new page when the current one is full"""
+
+    def __init__(self):
+        self.pages = []
+        self._new_page()
+
+    def _new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def _reserve(self, height: float):
+        if self.y - height < MARGIN and self.y < PAGE_HEIGHT - MARGIN:
+            self._new_page()
+        self.y -= height
+
+    def text(self, text: str, font: str = REGULAR, size: float = 10, indent: float = 0, gap: float = 0):
+        self.y -= gap
+        for line in wrap(text, font, size, TEXT_WIDTH - indent):
+            self._reserve(size * 1.25)
+            self.ops.append(
+                b"BT /%s %.1f Tf %.2f %.2f Td %s Tj ET"
+                % (font.encode(), size, MARGIN + indent, self.y + size * 0.25, _pdf_string(line))
+            )
+
+    def rule(self, gap: float = 2):
+        self._reserve(gap)
+        self.ops.append(b"0.5 w %.2f %.2f m %.2f %.2f l S" % (MARGIN, self.y, PAGE_WIDTH - MARGIN, self.y))
+
+def _join(*parts) -> str:
+    return " | ".join(str(part) for part in parts if part)
+
+def _section(layout: _Layout, heading: str):
+    layout.text(heading.upper(), BOLD, 11.5, gap=10)
+    layout.rule()
+
+def _entries(layout: _Layout, heading: str, items: list, title, meta, description="description"):
+    if not items:
+        return
+    _section(layout, heading)
+    for item in items:
+        layout.text(_join(*(item.get(key) for key in title)), BOLD, 10.5, gap=5)
+        if _join(*(item.get(key) for key in meta)):
+            layout.text(_join(*(item.get(key) for key in meta)), REGULAR, 9)
+        if item.get(description):
+            layout.text(item[description], REGULAR, 10, indent=8, gap=1)
+
+def layout_resume(resume: dict) -> list:
+    """Lay the resume out as a single text column; returns one list of drawing ops per page"""
+    info = resume.get('personal_info') or {}
+    layout = _Layout()
+    layout.text(info.get('name') or resume.get('version_name') or "Resume", BOLD, 20)
+    if info.get('title'):
+        layout.text(info['title'], REGULAR, 12, gap=2)
+    contact = _join(info.get('email'), info.get('phone'), info.get('address'))
+    if contact:
+        layout.text(contact, REGULAR, 9, gap=4)
+    links = _join(*(f"{link.get('platform')}: {link.get('url')}" for link in resume.get('links') or []))
+    if links:
+        layout.text(links, REGULAR, 9)
+
+    if info.get('summary'):
+        _section(layout, "Professional Summary")
+        layout.text(info['summary'], REGULAR, 10, gap=4)
+    _entries(layout, "Work Experience", resume.get('experience'), ("title", "company"), ("period",))
+    _entries(layout, "Projects", resume.get('projects'), ("name",), ("period", "technologies", "link"))
+    if resume.get('skills'):
+        _section(layout, "Skills")
+        layout.text(", ".join(resume['skills']), REGULAR, 10, gap=4)
+    _entries(layout, "Education", resume.get('education'), ("degree", "institution"), ("period",))
+    _entries(layout, "Certificates", resume.get('certificates'), ("name",), ("issuer", "date"))
+    _entries(layout, "Achievements", resume.get('achievements'), ("title",), ("date",))
+    return layout.pages
+
+def render_lite_pdf(resume: dict) -> bytes:
+    """Write a text-only PDF of the resume directly, without wkhtmltopdf"""
+    pages = layout_resume(resume)
+    font_ids = {name: 3 + index for index, name in enumerate(FONTS)}
+    first_page = 3 + len(FONTS)
+    info_id = first_page + 2 * len(pages)
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>"
+        % (b" ".join(b"%d 0 R" % (first_page + 2 * i) for i in range(len(pages))), len(pages)),
+    ]
+    for name, base_font in FONTS.items():
+        objects.append(
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /%s /Encoding /WinAnsiEncoding >>" % base_font.encode()
+        )
+    fonts = b" ".join(b"/%s %d 0 R" % (name.encode(), font_ids[name]) for name in FONTS)
+    for index, ops in enumerate(pages):
+        content = zlib.compress(b"\n".join(ops))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %.2f %.2f] /Resources << /Font << %s >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, fonts, first_page + 2 * index + 1)
+        )
+        objects.append(
+            b"<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream" % (len(content), content)
+        )
+    objects.append(b"<< /Title %s /Producer (ResumeCraft lite) >>" % _pdf_string(resume.get('version_name') or "Resume"))
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, info_id, xref
+    )
+    return bytes(out)
@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, List, Optional, Tuple
+import threading
+
+class LRUCache:
+    """Thread-safe least-recently-used map bounded by total size, with hit/miss counters.
+
+    size_of gives the size of a value; the default of 1 per value makes max_size an
+    entry count. put() returns what it evicted, so callers can release files or other
+    resources outside the lock.
+    """
+
+    def __init__(self, max_size: int, size_of: Optional[Callable[[object], int]] = None, unit: str = "entries"):
+        self.max_size = max_size
+        self.unit = unit
+        self.hits = 0
+        self.misses = 0
+        self._size_of = size_of or (lambda value: 1)
+        self._entries = OrderedDict()  # key -> (value, size), least recently used first
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        """The value for key, or None on a miss; a hit makes it the most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def contains(self, key: Hashable) -> bool:
+        """Membership check that does not touch LRU order or the hit/miss counters"""
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key: Hashable, value) -> List[Tuple[Hashable, object]]:
+        """Store value as the most recently used; returns the (key, value) pairs evicted"""
+        size = self._size_of(value)
+        if size > self.max_size:
+            # Would evict everything else and still not fit
+            self.discard(key)
+            return [(key, value)]
+        evicted = []
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_size:
+                evicted_key, (evicted_value, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+                evicted.append((evicted_key, evicted_value))
+        return evicted
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+            if self.unit != "entries":
+                stats[self.unit] = self._size
+            stats[f"max_{self.unit}"] = self.max_size
+            return stats
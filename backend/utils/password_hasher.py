@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# bcrypt releases the GIL, so threads hash in parallel without blocking the event loop
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_SIZE = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", "32"))
+PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", "2"))
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password executor has no room for another hash"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Password hasher is busy")
+        self.retry_after = retry_after
+
+class PasswordHasher:
+    """Dedicated threads for bcrypt work with bounded admission"""
+
+    def __init__(self, workers: int, queue_size: int, retry_after: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        # Only touched from the event loop thread, so no lock is needed
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) on a hashing thread, rejecting when the queue is full"""
+        # Rejecting at once beats queueing logins that would time out anyway
+        if self._pending >= self.workers + self.queue_size:
+            self._rejected += 1
+            raise PasswordHasherBusy(self.retry_after)
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            self._pending -= 1
+        self._completed += 1
+        return result
+
+    def stop(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "capacity": self.workers + self.queue_size,
+            "completed": self._completed,
+            "rejected": self._rejected,
+        }
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE, PASSWORD_HASH_RETRY_AFTER)
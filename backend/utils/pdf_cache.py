@@ -0,0 +1,96 @@
+from typing import Optional
+import os
+import tempfile
+from dotenv import load_dotenv
+from utils.hashing import stable_hash, strip_ids
+from utils.lru import LRUCache
+
+load_dotenv()
+
+PDF_CACHE_DIR = os.getenv(
+    "PDF_CACHE_DIR", os.path.join(tempfile.gettempdir(), "resumecraft_pdf_cache")
+)
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Stored fields that never reach the rendered document
+NON_CONTENT_FIELDS = ("_id", "user_id", "created_at", "updated_at", "revision")
+
+def content_hash(resume: dict, options: Optional[dict] = None) -> str:
+    """Stable hash of the renderable resume content plus the render options"""
+    content = {k: v for k, v in resume.items() if k not in NON_CONTENT_FIELDS}
+    return stable_hash({"resume": strip_ids(content), "options": options or {}})
+
+class PdfCache:
+    """Content-addressed on-disk store (PDFs by default) with size-bounded LRU eviction"""
+
+    def __init__(self, directory: str, max_bytes: int, extension: str = ".pdf"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+        # key -> file size; the files themselves live in directory
+        self._index = LRUCache(max_bytes, size_of=lambda size: size, unit="bytes")
+        os.makedirs(directory, exist_ok=True)
+        self._load_existing()
+
+    def _load_existing(self):
+        # Re-adopt entries left by a previous process, least recently used first
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.extension):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name[:-len(self.extension)], stat.st_size))
+        for _, key, size in sorted(files):
+            self._remove_files(self._index.put(key, size))
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.extension}")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file path for key, or None on a miss"""
+        path = self.path_for(key)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            # Never stored, or removed behind our back
+            self._index.discard(key)
+        else:
+            if not self._index.contains(key):
+                # Written by another process sharing the directory, e.g. a render consumer
+                self._remove_files(self._index.put(key, size))
+        return path if self._index.get(key) is not None else None
+
+    def contains(self, key: str) -> bool:
+        """Membership check that does not touch LRU order or the hit/miss counters"""
+        return self._index.contains(key) or os.path.exists(self.path_for(key))
+
+    def put(self, key: str, data: bytes) -> str:
+        """Store rendered bytes under key and return the cached path"""
+        path = self.path_for(key)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._remove_files(self._index.put(key, len(data)))
+        return path
+
+    def _remove_files(self, evicted: list):
+        for key, _ in evicted:
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        return self._index.stats()
+
+pdf_cache = PdfCache(PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES)
@@ -0,0 +1,66 @@
+import os
+import pdfkit
+from dotenv import load_dotenv
+from utils.templates import DEFAULT_TEMPLATE, load_templates, render_resume_html, template_version
+from utils.pdf_cache import content_hash
+from utils.lite_pdf import render_lite_pdf
+
+load_dotenv()
+
+WKHTMLTOPDF_PATH = os.getenv('wkhtmltopdf', '/usr/local/bin/wkhtmltopdf')
+
+PDF_OPTIONS = {
+    'enable-local-file-access': None,   # needed if you use local CSS/images
+    'page-size': 'A4',
+    'margin-top': '0.5in',
+    'margin-right': '0.5in',
+    'margin-bottom': '0.5in',
+    'margin-left': '0.5in',
+    'encoding': "UTF-8",
+    'no-outline': None
+}
+
+# ?engine= values accepted by the download endpoint
+PDF_ENGINES = ("wkhtmltopdf", "lite")
+DEFAULT_PDF_ENGINE = "wkhtmltopdf"
+
+WARMUP_HTML = "<!DOCTYPE html><html><head><meta charset='UTF-8'></head><body><p>warmup</p></body></html>"
+
+# Resolved once per render worker by init_worker
+_configuration = None
+
+def pdf_cache_key(resume: dict, template: str = DEFAULT_TEMPLATE) -> str:
+    # A deploy that changes the templates must not serve PDFs kept from before it
+    return content_hash(resume, {"template": template, "source": template_version(), "pdf": PDF_OPTIONS})
+
+def get_configuration():
+    global _configuration
+    if _configuration is None:
+        _configuration = pdfkit.configuration(wkhtmltopdf=WKHTMLTOPDF_PATH)
+    return _configuration
+
+def init_worker():
+    """Render worker initializer: resolve the binary once and warm the engine"""
+    load_templates()
+    try:
+        # A throwaway render pulls wkhtmltopdf, its libraries and fonts into the page cache
+        pdfkit.from_string(WARMUP_HTML, False, options=PDF_OPTIONS, configuration=get_configuration())
+    except Exception as e:
+        print(f"PDF renderer warm-up failed: {e}")
+
+def render_resume_pdf(resume: dict, template: str = DEFAULT_TEMPLATE):
+    """Render resume to PDF bytes; returns (data, rendered), rendered False for the lite fallback"""
+    # Generate HTML content for the resume
+    html_content = generate_resume_html(resume, template)
+
+    try:
+        # output_path=False makes pdfkit return the PDF from wkhtmltopdf's stdout
+        pdf = pdfkit.from_string(html_content, False, options=PDF_OPTIONS, configuration=get_configuration())
+        return pdf, True
+    except Exception as e:
+        # Fall back to the in-process text renderer so the client still gets a valid PDF
+        print(f"wkhtmltopdf render failed, using the lite renderer: {e}")
+        return render_lite_pdf(resume), False
+
+def generate_resume_html(resume: dict, template: str = DEFAULT_TEMPLATE) -> str:
+    return render_resume_html(resume, template)
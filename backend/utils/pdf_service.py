@@ -0,0 +1,29 @@
+import asyncio
+import os
+from dotenv import load_dotenv
+from utils.pdf_cache import pdf_cache
+from utils.pdf_renderer import pdf_cache_key, render_resume_pdf
+from utils.render_pool import render_pool
+from utils.singleflight import SingleFlight
+from utils.templates import DEFAULT_TEMPLATE
+
+load_dotenv()
+
+# How long a caller waits on a shared render before giving up (the render keeps going)
+RENDER_TIMEOUT_SECONDS = float(os.getenv("RENDER_TIMEOUT_SECONDS", "60"))
+
+render_flights = SingleFlight()
+
+async def render_pdf(resume: dict, template: str = DEFAULT_TEMPLATE, cache_key: str = None):
+    """Render at most once per distinct input at a time; returns (pdf_bytes, rendered)"""
+    # RenderQueueFull and timeouts propagate to every coalesced caller
+    cache_key = cache_key or pdf_cache_key(resume, template)
+
+    async def render():
+        pdf_bytes, rendered = await render_pool.run(render_resume_pdf, resume, template)
+        # Only wkhtmltopdf renders are cached; after a lite fallback it is retried next time
+        if rendered:
+            await asyncio.to_thread(pdf_cache.put, cache_key, pdf_bytes)
+        return pdf_bytes, rendered
+
+    return await render_flights.do(cache_key, render, timeout=RENDER_TIMEOUT_SECONDS)
@@ -0,0 +1,64 @@
+import asyncio
+import os
+from dotenv import load_dotenv
+from utils.pdf_cache import pdf_cache
+from utils.pdf_renderer import pdf_cache_key
+from utils.pdf_service import render_pdf
+from utils.render_pool import render_pool, RenderQueueFull
+from utils.templates import DEFAULT_TEMPLATE
+from utils.thumbnails import THUMBNAILS_ENABLED, thumbnail_cache, thumbnail_key, generate_thumbnail, ThumbnailError
+
+load_dotenv()
+
+PRERENDER_ENABLED = os.getenv("PRERENDER_ENABLED", "false").lower() in ("1", "true", "yes")
+# Wait this long after the last save before rendering, so bursts of edits render once
+PRERENDER_DEBOUNCE_SECONDS = float(os.getenv("PRERENDER_DEBOUNCE_SECONDS", "3"))
+
+# resume_id -> pending pre-render task for its newest saved version
+_pending = {}
+
+async def schedule_prerender(resume: dict):
+    """Queue a debounced render of this resume version, superseding older versions"""
+    if not PRERENDER_ENABLED and not THUMBNAILS_ENABLED:
+        return
+    resume_id = str(resume["_id"])
+    previous = _pending.get(resume_id)
+    if previous is not None:
+        previous.cancel()
+    _pending[resume_id] = asyncio.create_task(_prerender(resume_id, resume))
+
+async def _prerender(resume_id: str, resume: dict):
+    try:
+        await asyncio.sleep(PRERENDER_DEBOUNCE_SECONDS)
+        # Dashboard thumbnails first: they are requested on every dashboard load
+        if THUMBNAILS_ENABLED:
+            key = thumbnail_key(resume)
+            if not thumbnail_cache.contains(key) and render_pool.pending < render_pool.workers:
+                try:
+                    await generate_thumbnail(resume, key)
+                except ThumbnailError as e:
+                    # Do not hold back the PDF pre-render
+                    print(f"Thumbnail of resume {resume_id} failed: {e}")
+        if not PRERENDER_ENABLED:
+            return
+        cache_key = pdf_cache_key(resume, DEFAULT_TEMPLATE)
+        if pdf_cache.contains(cache_key):
+            return
+        # Pre-renders only use idle workers; user-facing downloads keep the queue
+        if render_pool.pending >= render_pool.workers:
+            return
+        await render_pdf(resume, DEFAULT_TEMPLATE, cache_key)
+    except asyncio.CancelledError:
+        raise
+    except (RenderQueueFull, asyncio.TimeoutError):
+        pass
+    except Exception as e:
+        print(f"Pre-render of resume {resume_id} failed: {e}")
+    finally:
+        if _pending.get(resume_id) is asyncio.current_task():
+            del _pending[resume_id]
+
+def cancel_prerenders():
+    for task in _pending.values():
+        task.cancel()
+    _pending.clear()
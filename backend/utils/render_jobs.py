@@ -0,0 +1,426 @@
+"""Asynchronous render jobs: a job store plus consumers that render on the render pool.
+
+With RENDER_JOB_STORE=sqlite the store can be shared by the API processes and
+dedicated consumer processes on one host, all using the same PDF_CACHE_DIR.
+Run a consumer from the backend directory:
+
+    python -m utils.render_jobs
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from dotenv import load_dotenv
+from utils.pdf_cache import pdf_cache
+from utils.pdf_renderer import pdf_cache_key
+from utils.pdf_service import render_pdf
+from utils.render_pool import render_pool, RenderQueueFull
+
+load_dotenv()
+
+RENDER_JOB_STORE = os.getenv("RENDER_JOB_STORE", "memory")  # "memory" or "sqlite"
+RENDER_JOB_DB = os.getenv(
+    "RENDER_JOB_DB", os.path.join(tempfile.gettempdir(), "resumecraft_render_jobs.sqlite3")
+)
+# 0 makes this process only submit jobs, leaving them to dedicated consumer processes
+RENDER_JOB_CONSUMERS = int(os.getenv("RENDER_JOB_CONSUMERS", os.getenv("RENDER_WORKERS", "2")))
+RENDER_JOB_MAX_QUEUED = int(os.getenv("RENDER_JOB_MAX_QUEUED", "100"))
+RENDER_JOB_TTL_SECONDS = int(os.getenv("RENDER_JOB_TTL_SECONDS", "3600"))
+RENDER_JOB_POLL_SECONDS = float(os.getenv("RENDER_JOB_POLL_SECONDS", "1"))
+# Consumers refresh the heartbeat of the jobs they are running; a running job whose
+# heartbeat is older than RENDER_JOB_STALE_SECONDS lost its consumer and is failed
+RENDER_JOB_HEARTBEAT_SECONDS = float(os.getenv("RENDER_JOB_HEARTBEAT_SECONDS", "10"))
+RENDER_JOB_STALE_SECONDS = float(os.getenv("RENDER_JOB_STALE_SECONDS", "60"))
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+class RenderJobQueueFull(Exception):
+    pass
+
+def new_job(user_id: str, resume: dict, template: str) -> dict:
+    return {
+        "id": uuid.uuid4().hex,
+        "user_id": user_id,
+        "resume_id": str(resume["_id"]),
+        "template": template,
+        "cache_key": pdf_cache_key(resume, template),
+        "status": QUEUED,
+        "error": None,
+        "payload": resume,
+        "created_at": time.time(),
+        "started_at": None,
+        "finished_at": None,
+        "owner": None,
+        "heartbeat_at": None,
+    }
+
+class MemoryJobStore:
+    """Process-local job store; jobs are lost on restart"""
+
+    def __init__(self):
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def create(self, job: dict):
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    async def update(self, job_id: str, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    async def claim_next(self, owner: str) -> Optional[dict]:
+        with self._lock:
+            for job in self._jobs.values():
+                if job["status"] == QUEUED:
+                    now = time.time()
+                    job.update(status=RUNNING, started_at=now, owner=owner, heartbeat_at=now)
+                    return dict(job)
+            return None
+
+    async def count_queued(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job["status"] == QUEUED)
+
+    async def heartbeat(self, owner: str):
+        with self._lock:
+            now = time.time()
+            for job in self._jobs.values():
+                if job["status"] == RUNNING and job["owner"] == owner:
+                    job["heartbeat_at"] = now
+
+    async def fail_stale(self, older_than: float, error: str):
+        with self._lock:
+            for job in self._jobs.values():
+                if job["status"] == RUNNING and job["heartbeat_at"] < older_than:
+                    job.update(status=FAILED, error=error, finished_at=time.time())
+
+    async def requeue(self, owner: str):
+        with self._lock:
+            for job in self._jobs.values():
+                if job["status"] == RUNNING and job["owner"] == owner:
+                    job.update(status=QUEUED, started_at=None, owner=None, heartbeat_at=None)
+
+    async def prune(self, older_than: float):
+        with self._lock:
+            for job_id in [
+                job_id for job_id, job in self._jobs.items()
+                if job["finished_at"] is not None and job["finished_at"] < older_than
+            ]:
+                del self._jobs[job_id]
+
+class SqliteJobStore:
+    """Job store in a local SQLite file, shared by every API and consumer process on the host"""
+
+    COLUMNS = (
+        "id", "user_id", "resume_id", "template", "cache_key", "status",
+        "error", "payload", "created_at", "started_at", "finished_at",
+        "owner", "heartbeat_at",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        # Processes starting together must not race the schema upgrade
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS render_jobs (
+                    id TEXT PRIMARY KEY,
+                    user_id TEXT NOT NULL,
+                    resume_id TEXT NOT NULL,
+                    template TEXT NOT NULL,
+                    cache_key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    error TEXT,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    owner TEXT,
+                    heartbeat_at REAL
+                )"""
+            )
+            # Files created before consumers had owners and heartbeats
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(render_jobs)")}
+            for column, kind in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE render_jobs ADD COLUMN {column} {kind}")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS render_jobs_status_created ON render_jobs (status, created_at)"
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; asyncio.to_thread reuses a small set of threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _row_to_job(self, row) -> Optional[dict]:
+        if row is None:
+            return None
+        job = dict(zip(self.COLUMNS, row))
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def _create(self, job: dict):
+        values = dict(job, payload=json.dumps(job["payload"], default=str))
+        self._connect().execute(
+            f"INSERT INTO render_jobs ({', '.join(self.COLUMNS)}) VALUES ({', '.join('?' * len(self.COLUMNS))})",
+            [values[column] for column in self.COLUMNS],
+        )
+
+    def _get(self, job_id: str):
+        row = self._connect().execute(
+            f"SELECT {', '.join(self.COLUMNS)} FROM render_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._row_to_job(row)
+
+    def _update(self, job_id: str, fields: dict):
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        self._connect().execute(
+            f"UPDATE render_jobs SET {assignments} WHERE id = ?", [*fields.values(), job_id]
+        )
+
+    def _claim_next(self, owner: str):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM render_jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                (QUEUED,),
+            ).fetchone()
+            job = self._row_to_job(row)
+            if job is not None:
+                now = time.time()
+                job.update(status=RUNNING, started_at=now, owner=owner, heartbeat_at=now)
+                conn.execute(
+                    "UPDATE render_jobs SET status = ?, started_at = ?, owner = ?, heartbeat_at = ? WHERE id = ?",
+                    (RUNNING, now, owner, now, job["id"]),
+                )
+            conn.execute("COMMIT")
+            return job
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _count_queued(self) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM render_jobs WHERE status = ?", (QUEUED,)
+        ).fetchone()[0]
+
+    def _heartbeat(self, owner: str):
+        self._connect().execute(
+            "UPDATE render_jobs SET heartbeat_at = ? WHERE status = ? AND owner = ?",
+            (time.time(), RUNNING, owner),
+        )
+
+    def _fail_stale(self, older_than: float, error: str):
+        # Jobs claimed before heartbeats were recorded only have started_at
+        self._connect().execute(
+            "UPDATE render_jobs SET status = ?, error = ?, finished_at = ?"
+            " WHERE status = ? AND COALESCE(heartbeat_at, started_at) < ?",
+            (FAILED, error, time.time(), RUNNING, older_than),
+        )
+
+    def _requeue(self, owner: str):
+        self._connect().execute(
+            "UPDATE render_jobs SET status = ?, started_at = NULL, owner = NULL, heartbeat_at = NULL"
+            " WHERE status = ? AND owner = ?",
+            (QUEUED, RUNNING, owner),
+        )
+
+    def _prune(self, older_than: float):
+        self._connect().execute(
+            "DELETE FROM render_jobs WHERE finished_at IS NOT NULL AND finished_at < ?", (older_than,)
+        )
+
+    async def create(self, job: dict):
+        await asyncio.to_thread(self._create, job)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self._get, job_id)
+
+    async def update(self, job_id: str, **fields):
+        await asyncio.to_thread(self._update, job_id, fields)
+
+    async def claim_next(self, owner: str) -> Optional[dict]:
+        return await asyncio.to_thread(self._claim_next, owner)
+
+    async def count_queued(self) -> int:
+        return await asyncio.to_thread(self._count_queued)
+
+    async def heartbeat(self, owner: str):
+        await asyncio.to_thread(self._heartbeat, owner)
+
+    async def fail_stale(self, older_than: float, error: str):
+        await asyncio.to_thread(self._fail_stale, older_than, error)
+
+    async def requeue(self, owner: str):
+        await asyncio.to_thread(self._requeue, owner)
+
+    async def prune(self, older_than: float):
+        await asyncio.to_thread(self._prune, older_than)
+
+def create_job_store():
+    if RENDER_JOB_STORE == "sqlite":
+        return SqliteJobStore(RENDER_JOB_DB)
+    if RENDER_JOB_STORE == "memory":
+        return MemoryJobStore()
+    raise ValueError(f"Unknown RENDER_JOB_STORE: {RENDER_JOB_STORE}")
+
+class RenderJobRunner:
+    """Consumes queued render jobs from the store and renders them on the render pool"""
+
+    def __init__(self, consumers: int):
+        self.consumers = consumers
+        self.store = None
+        # Marks the jobs this process claims; unique across hosts, processes and restarts
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks = []
+        self._wakeup = None
+        self._running = False
+
+    async def start(self):
+        self.store = create_job_store()
+        self._wakeup = asyncio.Event()
+        self._running = True
+        if self.consumers:
+            self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.consumers)]
+            self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self):
+        # wait_for can swallow a cancel that races the wakeup, so also signal by flag
+        self._running = False
+        if self._wakeup is not None:
+            self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.store is not None and self.consumers:
+            # Renders cut short here can be picked up by another consumer
+            await self.store.requeue(self.owner)
+
+    async def submit(self, user_id: str, resume: dict, template: str) -> dict:
+        job = new_job(user_id, resume, template)
+        if pdf_cache.contains(job["cache_key"]):
+            # Already rendered: the job is born finished
+            now = time.time()
+            job.update(status=DONE, started_at=now, finished_at=now)
+        elif await self.store.count_queued() >= RENDER_JOB_MAX_QUEUED:
+            raise RenderJobQueueFull()
+        await self.store.create(job)
+        self._wakeup.set()
+        return job
+
+    async def _heartbeat(self):
+        while self._running:
+            await asyncio.sleep(RENDER_JOB_HEARTBEAT_SECONDS)
+            await self.store.heartbeat(self.owner)
+
+    async def _consume(self):
+        while self._running:
+            job = await self.store.claim_next(self.owner)
+            if job is None:
+                now = time.time()
+                # Only a consumer that died (crash, kill) leaves its jobs running without a heartbeat
+                await self.store.fail_stale(now - RENDER_JOB_STALE_SECONDS, "Render consumer stopped unexpectedly")
+                await self.store.prune(now - RENDER_JOB_TTL_SECONDS)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), RENDER_JOB_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: dict):
+        while True:
+            try:
+                pdf_bytes, rendered = await render_pdf(job["payload"], job["template"], job["cache_key"])
+                break
+            except RenderQueueFull as e:
+                # Interactive downloads hold the pool; try again shortly
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                await self.store.update(job["id"], status=FAILED, error=str(e), finished_at=time.time())
+                return
+
+        if not rendered:
+            await self.store.update(
+                job["id"], status=FAILED, error="PDF engine failed to render", finished_at=time.time()
+            )
+            return
+        await self.store.update(job["id"], status=DONE, finished_at=time.time())
+
+def job_status(job: dict) -> dict:
+    """Public view of a job record, with timings in seconds"""
+    def timestamp(value):
+        return datetime.utcfromtimestamp(value) if value is not None else None
+
+    started, finished = job["started_at"], job["finished_at"]
+    return {
+        "job_id": job["id"],
+        "resume_id": job["resume_id"],
+        "template": job["template"],
+        "status": job["status"],
+        "error": job["error"],
+        "created_at": timestamp(job["created_at"]),
+        "started_at": timestamp(started),
+        "finished_at": timestamp(finished),
+        "queued_seconds": round(started - job["created_at"], 3) if started is not None else None,
+        "render_seconds": round(finished - started, 3) if started is not None and finished is not None else None,
+    }
+
+render_jobs = RenderJobRunner(RENDER_JOB_CONSUMERS)
+
+async def main(consumers: int):
+    """Standalone consumer: renders jobs submitted by the API processes until SIGTERM/SIGINT"""
+    if RENDER_JOB_STORE != "sqlite":
+        raise SystemExit("A standalone consumer needs a shared store: set RENDER_JOB_STORE=sqlite")
+    runner = RenderJobRunner(consumers)
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopping.set)
+    await render_pool.start()
+    await runner.start()
+    print(f"Render job consumer {runner.owner} started with {consumers} consumers")
+    try:
+        await stopping.wait()
+    finally:
+        await runner.stop()
+        render_pool.stop()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render queued PDF jobs from the shared job store")
+    parser.add_argument(
+        "--consumers", type=int, default=RENDER_JOB_CONSUMERS or render_pool.workers,
+        help="jobs rendered at once (default: RENDER_JOB_CONSUMERS, or RENDER_WORKERS when that is 0)",
+    )
+    asyncio.run(main(max(parser.parse_args().consumers, 1)))
@@ -0,0 +1,133 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import asyncio
+import functools
+import multiprocessing
+import os
+from dotenv import load_dotenv
+from utils.pdf_renderer import init_worker
+
+load_dotenv()
+
+# Each worker process drives one wkhtmltopdf render at a time
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))
+RENDER_QUEUE_SIZE = int(os.getenv("RENDER_QUEUE_SIZE", "8"))
+RENDER_RETRY_AFTER = int(os.getenv("RENDER_RETRY_AFTER", "5"))
+# Replace a worker after this many jobs to bound leaks in the engine (0 disables)
+RENDER_RECYCLE_AFTER = int(os.getenv("RENDER_RECYCLE_AFTER", "100"))
+
+class RenderQueueFull(Exception):
+    """Raised when the render pool has no room for another job"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Render queue is full")
+        self.retry_after = retry_after
+
+def _call_in_worker(fn, args, kwargs):
+    return os.getpid(), fn(*args, **kwargs)
+
+class RenderPool:
+    """Long-lived, pre-warmed render worker processes with bounded admission"""
+
+    def __init__(self, workers: int, queue_size: int, retry_after: int, recycle_after: int):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.retry_after = retry_after
+        self.recycle_after = recycle_after
+        self._executor = None
+        # Only touched from the event loop thread, so no lock is needed
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._restarts = 0
+        self._jobs_by_pid = Counter()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _create_executor(self):
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            # Never fork: this process already runs Motor and to_thread threads, whose locks
+            # a forked child could inherit held. The default is only spawn when recycling is on
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+            max_tasks_per_child=self.recycle_after or None,
+        )
+
+    async def start(self):
+        """Spawn and warm every worker before the app starts taking traffic"""
+        if self._executor is not None:
+            return
+        self._executor = self._create_executor()
+        loop = asyncio.get_running_loop()
+        # Submitting one job per worker at once makes the executor spawn all of them
+        warmups = [
+            loop.run_in_executor(self._executor, _call_in_worker, os.getpid, (), {})
+            for _ in range(self.workers)
+        ]
+        for pid, _ in await asyncio.gather(*warmups):
+            self._jobs_by_pid[pid] += 1
+        print(f"PDF render pool started with {self.workers} workers")
+
+    def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._jobs_by_pid.clear()
+            print("PDF render pool stopped")
+
+    async def run(self, fn, *args, **kwargs):
+        """Await fn(*args, **kwargs) in a worker, rejecting when the queue is full"""
+        if self._executor is None:
+            raise RuntimeError("Render pool not started")
+        if self._pending >= self.workers + self.queue_size:
+            raise RenderQueueFull(self.retry_after)
+
+        self._pending += 1
+        executor = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            pid, result = await loop.run_in_executor(
+                executor, functools.partial(_call_in_worker, fn, args, kwargs)
+            )
+        except BrokenProcessPool:
+            # A worker died hard (e.g. OOM-killed); replace the whole pool
+            self._failed += 1
+            # Every job in flight on the broken pool lands here; only the first replaces it,
+            # later ones must not shut down the fresh pool and cancel its jobs
+            if self._executor is executor:
+                self._restarts += 1
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._create_executor()
+                self._jobs_by_pid.clear()
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+
+        self._completed += 1
+        self._jobs_by_pid[pid] += 1
+        if self.recycle_after and self._jobs_by_pid[pid] >= self.recycle_after:
+            # The executor retires this process; stop reporting it
+            del self._jobs_by_pid[pid]
+        return result
+
+    def health(self) -> dict:
+        return {
+            "status": "ok" if self._executor is not None else "stopped",
+            "workers": self.workers,
+            "recycle_after": self.recycle_after,
+            "pending": self._pending,
+            "capacity": self.workers + self.queue_size,
+            "completed": self._completed,
+            "failed": self._failed,
+            "restarts": self._restarts,
+            "processes": {str(pid): jobs for pid, jobs in self._jobs_by_pid.items()},
+        }
+
+render_pool = RenderPool(RENDER_WORKERS, RENDER_QUEUE_SIZE, RENDER_RETRY_AFTER, RENDER_RECYCLE_AFTER)
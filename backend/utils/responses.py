@@ -0,0 +1,63 @@
+from fastapi import BackgroundTasks
+from fastapi.responses import FileResponse, Response
+from utils.serialization import dumps
+from typing import Optional
+from urllib.parse import quote
+import asyncio
+import os
+import tempfile
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Outputs above this size are spilled to a private temp file instead of held in memory
+PDF_SPILL_BYTES = int(os.getenv("PDF_SPILL_BYTES", str(8 * 1024 * 1024)))
+PDF_SPILL_DIR = os.getenv("PDF_SPILL_DIR", tempfile.gettempdir())
+
+class MongoJSONResponse(Response):
+    """JSON response for trusted MongoDB documents, encoded with orjson.
+
+    Returned directly, so FastAPI skips validating it against response_model again.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+def content_disposition(filename: str, disposition: str = "attachment") -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True when an If-None-Match header lists etag (weak comparison, as for GET)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+def _write_spill_file(data: bytes) -> str:
+    # Unique per request, so concurrent downloads never share a file
+    fd, path = tempfile.mkstemp(prefix="resume_", suffix=".pdf", dir=PDF_SPILL_DIR)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    return path
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+async def pdf_response(data: bytes, filename: str, background_tasks: BackgroundTasks) -> Response:
+    """Send PDF bytes with an exact Content-Length, spilling very large outputs to disk"""
+    headers = {"Content-Disposition": content_disposition(filename)}
+    if len(data) <= PDF_SPILL_BYTES:
+        return Response(content=data, media_type="application/pdf", headers=headers)
+
+    path = await asyncio.to_thread(_write_spill_file, data)
+    # Added to the request's tasks so it runs after the body is sent
+    background_tasks.add_task(_remove_quietly, path)
+    return FileResponse(path, media_type="application/pdf", headers=headers)
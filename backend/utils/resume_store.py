@@ -0,0 +1,136 @@
+from pymongo import DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from typing import List, Optional, Tuple
+from bson import ObjectId
+from bson.errors import InvalidId
+import base64
+import json
+from datetime import datetime
+from utils.database import get_resume_collection
+
+# Every mutation is a single server round trip; uniqueness of (user_id, version_name)
+# is enforced by the user_version_unique index instead of a prior find_one
+
+LIST_MAX_LIMIT = 100
+
+# Fields a listing may project; user_id is implied by the query
+LISTABLE_FIELDS = (
+    "version_name", "personal_info", "experience", "education", "skills", "projects",
+    "certificates", "achievements", "links", "created_at", "updated_at",
+)
+# Summary mode reads only from the user_updated_listing index (a covered query)
+SUMMARY_FIELDS = ("version_name", "updated_at")
+
+class DuplicateVersionName(Exception):
+    pass
+
+class RevisionMismatch(Exception):
+    """The version exists but its revision is not one the client's If-Match allows"""
+    pass
+
+def resume_etag(resume: dict) -> str:
+    """Strong ETag of one version; every update bumps its revision"""
+    # Versions written before revisions were added count as revision 0
+    return f'"{resume["_id"]}.{resume.get("revision", 0)}"'
+
+def if_match_revisions(if_match: str, resume_id: ObjectId) -> Optional[List[int]]:
+    """Revisions of this version an If-Match header accepts; None for "*", which accepts any"""
+    if if_match.strip() == "*":
+        return None
+    revisions = []
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        # If-Match uses strong comparison, so weak tags never match
+        if tag.startswith("W/") or len(tag) < 2 or not (tag[0] == tag[-1] == '"'):
+            continue
+        tag_id, _, revision = tag[1:-1].partition(".")
+        if tag_id == str(resume_id) and revision.isdigit():
+            revisions.append(int(revision))
+    return revisions
+
+async def insert_resume(user_id: ObjectId, data: dict) -> dict:
+    """Insert a new version and return the stored document without reading it back"""
+    now = datetime.utcnow()
+    document = {**data, "user_id": user_id, "revision": 1, "created_at": now, "updated_at": now}
+    try:
+        # insert_one adds the generated _id to document
+        await get_resume_collection().insert_one(document)
+    except DuplicateKeyError:
+        raise DuplicateVersionName()
+    return document
+
+async def update_resume(
+    user_id: ObjectId, resume_id: ObjectId, update_data: dict, revisions: Optional[List[int]] = None
+) -> Optional[dict]:
+    """Apply update_data to the user's version; returns the updated document, None if not found.
+
+    With revisions, the update only applies while the stored revision is one of them
+    (checked in the same atomic update), otherwise RevisionMismatch is raised.
+    """
+    query = {"_id": resume_id, "user_id": user_id}
+    if revisions is not None:
+        # $in null also matches versions that have no revision yet (revision 0)
+        query["revision"] = {"$in": [*revisions, None] if 0 in revisions else revisions}
+    try:
+        updated = await get_resume_collection().find_one_and_update(
+            query,
+            {"$set": {**update_data, "updated_at": datetime.utcnow()}, "$inc": {"revision": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        raise DuplicateVersionName()
+    if updated is None and revisions is not None:
+        # Only on the failure path: tell a stale revision apart from a missing version
+        if await get_resume_collection().find_one({"_id": resume_id, "user_id": user_id}, {"_id": 1}):
+            raise RevisionMismatch()
+    return updated
+
+async def delete_resume(user_id: ObjectId, resume_id: ObjectId) -> Optional[dict]:
+    """Delete the user's version; returns its _id and version_name, None if not found"""
+    return await get_resume_collection().find_one_and_delete(
+        {"_id": resume_id, "user_id": user_id},
+        projection={"version_name": 1}
+    )
+
+def listing_projection(fields: Optional[str], summary: bool) -> dict:
+    """Projection for list_resumes; _id, and revision for the thumbnail key, are always included"""
+    if summary:
+        names = SUMMARY_FIELDS
+    elif fields:
+        names = [name.strip() for name in fields.split(",") if name.strip() and name.strip() not in ("_id", "id")]
+        unknown = [name for name in names if name not in LISTABLE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    else:
+        names = LISTABLE_FIELDS
+    # updated_at is needed for the next cursor even if not requested
+    return {"_id": 1, "updated_at": 1, "revision": 1, **{name: 1 for name in names}}
+
+def encode_cursor(resume: dict) -> str:
+    position = {"u": resume["updated_at"].isoformat(), "i": str(resume["_id"])}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return datetime.fromisoformat(position["u"]), ObjectId(position["i"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise ValueError("Invalid cursor")
+
+async def list_resumes(
+    user_id: ObjectId, projection: dict, limit: int, after: Optional[Tuple[datetime, ObjectId]] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """One page of the user's versions, newest update first, and the cursor for the next page"""
+    query = {"user_id": user_id}
+    if after is not None:
+        updated_at, resume_id = after
+        query["$or"] = [
+            {"updated_at": {"$lt": updated_at}},
+            {"updated_at": updated_at, "_id": {"$lt": resume_id}},
+        ]
+    # One extra document tells whether another page exists
+    resumes = await get_resume_collection().find(query, projection).sort(
+        [("updated_at", DESCENDING), ("_id", DESCENDING)]
+    ).limit(limit + 1).to_list(limit + 1)
+    next_cursor = encode_cursor(resumes[limit - 1]) if len(resumes) > limit else None
+    return resumes[:limit], next_cursor
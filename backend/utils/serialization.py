@@ -0,0 +1,57 @@
+from functools import lru_cache
+from typing import List, Type, Union, get_args, get_origin
+from bson import ObjectId
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+import orjson
+
+def _submodel(annotation):
+    """(model, many) when a field holds a model, Optional model or list of models"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    origin = get_origin(annotation)
+    for arg in get_args(annotation):
+        model, many = _submodel(arg)
+        if model is not None:
+            return model, many or origin in (list, List)
+    return None, False
+
+@lru_cache(maxsize=None)
+def _plan(model: Type[BaseModel]) -> tuple:
+    # Worked out once per model: output key, default and nested plan of every field
+    plan = []
+    # Like validation, fall back to the field name when the model populates by name
+    by_name = model.model_config.get("populate_by_name", False)
+    for name, field in model.model_fields.items():
+        submodel, many = _submodel(field.annotation)
+        key = field.alias or name
+        fallback = name if by_name and key != name else None
+        plan.append((key, fallback, field, _plan(submodel) if submodel else None, many))
+    return tuple(plan)
+
+def _project(doc: dict, plan: tuple) -> dict:
+    out = {}
+    for key, fallback, field, subplan, many in plan:
+        if key in doc or fallback in doc:
+            value = doc[key] if key in doc else doc[fallback]
+            if subplan is not None and value is not None:
+                value = [_project(item, subplan) for item in value] if many else _project(value, subplan)
+        else:
+            value = field.get_default(call_default_factory=True)
+            if value is PydanticUndefined:
+                continue
+        out[key] = value
+    return out
+
+def project(doc: dict, model: Type[BaseModel]) -> dict:
+    """Shape a trusted MongoDB document like model(**doc) dumped by alias, without validating it"""
+    return _project(doc, _plan(model))
+
+def _default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Union[dict, list]) -> bytes:
+    # orjson writes datetimes as ISO 8601 natively; ObjectIds become strings
+    return orjson.dumps(content, default=_default)
@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+import hashlib
+import os
+import secrets
+from bson import ObjectId
+from dotenv import load_dotenv
+from pymongo import ReturnDocument
+from utils.database import get_session_collection
+
+load_dotenv()
+
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+# Two tabs refreshing at once present the same token; only a later replay counts as theft
+REFRESH_REUSE_GRACE_SECONDS = int(os.getenv("REFRESH_REUSE_GRACE_SECONDS", "10"))
+
+def _token_hash(refresh_token: str) -> str:
+    # Only hashes are stored, so a database leak does not leak usable tokens.
+    # Tokens are random, so a fast hash is enough; no bcrypt needed
+    return hashlib.sha256(refresh_token.encode("utf-8")).hexdigest()
+
+def _expires_at(now: datetime) -> datetime:
+    return now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+
+async def create_session(user_id: ObjectId, user_agent: Optional[str] = None) -> str:
+    """Start a session for a user who just logged in and return its first refresh token"""
+    refresh_token = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    await get_session_collection().insert_one({
+        "user_id": user_id,
+        "token": _token_hash(refresh_token),
+        "previous": None,
+        "user_agent": user_agent,
+        "created_at": now,
+        "last_used_at": now,
+        "expires_at": _expires_at(now),
+    })
+    return refresh_token
+
+async def rotate_session(refresh_token: str) -> Optional[Tuple[ObjectId, str]]:
+    """Swap a refresh token for a new one: (user_id, new token), or None if it is not current"""
+    session_collection = get_session_collection()
+    token_hash = _token_hash(refresh_token)
+    new_token = secrets.token_urlsafe(32)
+    now = datetime.utcnow()
+    # One atomic update on the unique token index: concurrent refreshes cannot both win
+    session = await session_collection.find_one_and_update(
+        {"token": token_hash, "expires_at": {"$gt": now}},
+        {"$set": {
+            "token": _token_hash(new_token),
+            "previous": token_hash,
+            "last_used_at": now,
+            "expires_at": _expires_at(now),
+        }},
+        projection={"user_id": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if session is not None:
+        return session["user_id"], new_token
+
+    # A token that was already rotated away is being replayed; end the session it belonged to
+    replayed = await session_collection.find_one({"previous": token_hash}, {"last_used_at": 1})
+    if replayed is not None and now - replayed["last_used_at"] > timedelta(seconds=REFRESH_REUSE_GRACE_SECONDS):
+        await session_collection.delete_one({"_id": replayed["_id"]})
+    return None
+
+async def revoke_session(refresh_token: str):
+    await get_session_collection().delete_one({"token": _token_hash(refresh_token)})
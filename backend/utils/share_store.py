@@ -0,0 +1,149 @@
+from typing import Optional
+import asyncio
+import json
+import os
+import re
+import secrets
+import shutil
+import tempfile
+from dotenv import load_dotenv
+from utils.database import get_resume_collection, get_share_collection
+from utils.pdf_cache import content_hash
+from utils.pdf_service import render_pdf
+from utils.render_pool import RenderQueueFull
+from utils.templates import render_resume_html, template_version
+
+load_dotenv()
+
+# Snapshots are only a copy of what the shares collection lists: a node missing one re-publishes it
+SHARE_DIR = os.getenv(
+    "SHARE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "shares")
+)
+# Short, so a revoked link stops working in caches soon; revalidation is a cheap 304
+SHARE_MAX_AGE = int(os.getenv("SHARE_MAX_AGE", "60"))
+
+TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{32}$")
+
+def new_share_token() -> str:
+    return secrets.token_urlsafe(24)
+
+def share_version(resume: dict, template: str) -> str:
+    # Changes with the template source, so existing shares are re-published on the next save
+    return content_hash(resume, {"template": template, "source": template_version(), "kind": "share"})
+
+class ShareStore:
+    """Immutable per-version snapshots on local disk, one directory per share token"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _token_dir(self, token: str) -> str:
+        # Tokens come straight from the URL; never let one escape the store
+        if not TOKEN_PATTERN.match(token):
+            raise ValueError("Invalid share token")
+        return os.path.join(self.directory, token)
+
+    def path_for(self, token: str, version: str, extension: str) -> str:
+        return os.path.join(self._token_dir(token), f"{version}.{extension}")
+
+    def _write(self, path: str, data: bytes):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def current(self, token: str) -> Optional[dict]:
+        """Pointer to the published version, or None for unknown and revoked tokens"""
+        try:
+            with open(os.path.join(self._token_dir(token), "current.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def publish(self, token: str, version: str, title: str, html: bytes, pdf: bytes):
+        token_dir = self._token_dir(token)
+        os.makedirs(token_dir, exist_ok=True)
+        previous = self.current(token)
+        self._write(self.path_for(token, version, "html"), html)
+        self._write(self.path_for(token, version, "pdf"), pdf)
+        # Switch the pointer last, so readers only ever see a complete snapshot
+        pointer = json.dumps({"version": version, "title": title}).encode("utf-8")
+        self._write(os.path.join(token_dir, "current.json"), pointer)
+        # Keep the version just replaced for responses still being sent
+        keep = {version, previous["version"] if previous else None}
+        for name in os.listdir(token_dir):
+            stem, _, extension = name.rpartition(".")
+            if extension in ("html", "pdf") and stem not in keep:
+                try:
+                    os.remove(os.path.join(token_dir, name))
+                except OSError:
+                    pass
+
+    def revoke(self, token: str):
+        shutil.rmtree(self._token_dir(token), ignore_errors=True)
+
+share_store = ShareStore(SHARE_DIR)
+
+# token -> lock, so publishes of one token run in order and never race a revoke
+_locks = {}
+
+async def publish_share(token: str, resume: dict, template: str):
+    """Render the resume into the token's snapshot unless it is unchanged or the share was revoked"""
+    version = share_version(resume, template)
+    async with _locks.setdefault(token, asyncio.Lock()):
+        # The shares collection decides what is live; a missing snapshot only means this node has none yet
+        if await get_share_collection().find_one({"_id": token}, {"_id": 1}) is None:
+            return
+        current = await asyncio.to_thread(share_store.current, token)
+        if current is not None and current["version"] == version:
+            return
+        html = await asyncio.to_thread(render_resume_html, resume, template)
+        while True:
+            try:
+                # The lite fallback is still a valid PDF, so it is published as well
+                pdf, _ = await render_pdf(resume, template)
+                break
+            except RenderQueueFull as e:
+                await asyncio.sleep(e.retry_after)
+        await asyncio.to_thread(
+            share_store.publish, token, version, resume.get('version_name', ''), html.encode("utf-8"), pdf
+        )
+
+async def restore_share(token: str) -> Optional[dict]:
+    """Publish a live share this node has no snapshot of (restart, new replica); None if it does not exist"""
+    share = await get_share_collection().find_one({"_id": token})
+    if share is None:
+        return None
+    resume = await get_resume_collection().find_one({"_id": share["resume_id"], "user_id": share["user_id"]})
+    if resume is None:
+        return None
+    await publish_share(token, resume, share["template"])
+    return await asyncio.to_thread(share_store.current, token)
+
+async def revoke_share(token: str):
+    async with _locks.setdefault(token, asyncio.Lock()):
+        await asyncio.to_thread(share_store.revoke, token)
+    _locks.pop(token, None)
+
+async def refresh_shares(resume: dict):
+    """Re-publish every share of this resume after it was updated"""
+    share_collection = get_share_collection()
+    async for share in share_collection.find({"resume_id": resume["_id"]}):
+        try:
+            await publish_share(share["_id"], resume, share["template"])
+        except Exception as e:
+            print(f"Publishing share {share['_id']} failed: {e}")
+
+async def revoke_shares(resume_id):
+    """Remove every share of a deleted resume, from the database and the snapshot store"""
+    share_collection = get_share_collection()
+    tokens = [share["_id"] async for share in share_collection.find({"resume_id": resume_id}, {"_id": 1})]
+    await share_collection.delete_many({"resume_id": resume_id})
+    for token in tokens:
+        await revoke_share(token)
@@ -0,0 +1,46 @@
+from typing import Optional
+import asyncio
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one in-flight execution"""
+
+    def __init__(self):
+        self._calls = {}  # key -> asyncio.Future shared by every caller
+        self.started = 0
+        self.coalesced = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, fn, timeout: Optional[float] = None):
+        """Await fn() once per key; concurrent callers share its result or exception"""
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            # Reading the exception marks it retrieved when every caller has gone
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._calls[key] = future
+            self.started += 1
+            # A separate task, so a disconnecting first caller does not cancel the others
+            asyncio.ensure_future(self._run(key, fn, future))
+        else:
+            self.coalesced += 1
+        # shield: one caller timing out must not cancel the shared execution
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    async def _run(self, key: str, fn, future: asyncio.Future):
+        try:
+            result = await fn()
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+        else:
+            future.set_result(result)
+        finally:
+            self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        return {"in_flight": self.in_flight, "started": self.started, "coalesced": self.coalesced}
@@ -0,0 +1,171 @@
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+from typing import Optional
+import hashlib
+import os
+import re
+import tempfile
+from dotenv import load_dotenv
+from utils.hashing import stable_hash, strip_ids
+from utils.lru import LRUCache
+
+load_dotenv()
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+TEMPLATE_CACHE_DIR = os.getenv(
+    "TEMPLATE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "resumecraft_jinja_cache")
+)
+
+FRAGMENT_CACHE_SIZE = int(os.getenv("FRAGMENT_CACHE_SIZE", "2048"))
+
+DEFAULT_TEMPLATE = "classic"
+
+# Public template name -> template file
+RESUME_TEMPLATES = {
+    "classic": "resume/classic.html",
+    "compact": "resume/compact.html",
+}
+
+# Section name -> fragment template; shared by every page template
+SECTION_TEMPLATES = {
+    "summary": "resume/sections/summary.html",
+    "experience": "resume/sections/experience.html",
+    "projects": "resume/sections/projects.html",
+    "skills": "resume/sections/skills.html",
+    "education": "resume/sections/education.html",
+    "certificates": "resume/sections/certificates.html",
+    "achievements": "resume/sections/achievements.html",
+}
+
+# Schemes a user-supplied link may use; anything else (javascript:, data:, ...) loses its href
+SAFE_URL_SCHEMES = ("http", "https", "mailto")
+_URL_SCHEME = re.compile(r"^([a-z][a-z0-9+.-]*):", re.IGNORECASE)
+# Browsers ignore these inside a scheme, so "java\tscript:" still runs
+_URL_IGNORED = re.compile(r"[\x00-\x20\x7f]")
+
+class UnknownTemplate(ValueError):
+    pass
+
+def safe_url(value) -> Optional[str]:
+    """The URL if it uses an allowed scheme, else None; autoescaping alone does not stop javascript: links"""
+    if not value:
+        return None
+    url = str(value).strip()
+    match = _URL_SCHEME.match(_URL_IGNORED.sub("", url))
+    if match is None or match.group(1).lower() not in SAFE_URL_SCHEMES:
+        return None
+    return url
+
+# Rendered section HTML keyed by a hash of the section input
+fragment_cache = LRUCache(FRAGMENT_CACHE_SIZE)
+# (resume _id, revision) -> {section name: fragment key}, so each stored version is hashed once
+_section_keys = LRUCache(FRAGMENT_CACHE_SIZE)
+
+_env = None
+_css = None
+_version = None
+_compiled = {}
+_sections = {}
+
+def _create_environment() -> Environment:
+    os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(["html"]),
+        bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_DIR),
+        # Templates only change on deploy
+        auto_reload=False,
+    )
+    env.filters["safe_url"] = safe_url
+    return env
+
+def _source_hash() -> str:
+    # templates/resume plus this module, whose filters also shape the output
+    digest = hashlib.sha256()
+    resume_dir = os.path.join(TEMPLATE_DIR, "resume")
+    paths = [os.path.abspath(__file__)]
+    for root, dirs, files in os.walk(resume_dir):
+        dirs.sort()
+        paths.extend(os.path.join(root, name) for name in sorted(files))
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        name = os.path.relpath(path, TEMPLATE_DIR).encode("utf-8")
+        digest.update(b"%d:%s%d:" % (len(name), name, len(data)) + data)
+    return digest.hexdigest()[:16]
+
+def load_templates():
+    """Compile every registered resume template and the shared stylesheet once"""
+    global _env, _css, _version
+    if _env is not None:
+        return
+    _version = _source_hash()
+    _env = _create_environment()
+    with open(os.path.join(TEMPLATE_DIR, "resume", "resume.css"), encoding="utf-8") as f:
+        _css = Markup(f.read())
+    for name, path in RESUME_TEMPLATES.items():
+        _compiled[name] = _env.get_template(path)
+    for name, path in SECTION_TEMPLATES.items():
+        _sections[name] = _env.get_template(path)
+
+def template_version() -> str:
+    """Hash of the template and stylesheet source; part of every rendered-output cache key"""
+    load_templates()
+    return _version
+
+def get_template(name: str = DEFAULT_TEMPLATE):
+    load_templates()
+    try:
+        return _compiled[name]
+    except KeyError:
+        raise UnknownTemplate(f"Unknown resume template: {name}")
+
+def _section_inputs(resume: dict) -> dict:
+    info = resume.get('personal_info') or {}
+    inputs = {"summary": {"summary": info.get('summary')}}
+    for name in SECTION_TEMPLATES:
+        if name != "summary":
+            inputs[name] = {"items": resume.get(name) or []}
+    return inputs
+
+def section_key(name: str, context: dict) -> str:
+    return stable_hash([name, strip_ids(context)])
+
+def _fragment_keys(resume: dict, inputs: dict) -> dict:
+    # Every update bumps the revision, so a stored version's section inputs never change
+    version = (resume.get('_id'), resume.get('revision'))
+    stored = None not in version
+    keys = _section_keys.get(version) if stored else None
+    if keys is None:
+        keys = {name: section_key(name, context) for name, context in inputs.items()}
+        if stored:
+            _section_keys.put(version, keys)
+    return keys
+
+def render_section(name: str, context: dict, key: Optional[str] = None) -> Markup:
+    """Render one section, reusing the cached fragment when its input is unchanged"""
+    key = key or section_key(name, context)
+    fragment = fragment_cache.get(key)
+    if fragment is None:
+        load_templates()
+        fragment = Markup(_sections[name].render(**context))
+        fragment_cache.put(key, fragment)
+    return fragment
+
+def render_resume_html(resume: dict, template: str = DEFAULT_TEMPLATE) -> str:
+    page = get_template(template)
+    inputs = _section_inputs(resume)
+    keys = _fragment_keys(resume, inputs)
+    sections = {name: render_section(name, context, keys[name]) for name, context in inputs.items()}
+    # List sections with items; the summary never counted towards the two-column layout
+    section_count = sum(1 for name, context in inputs.items() if name != "summary" and context["items"])
+    if resume.get('links'):
+        # Links render in the header but still count towards the two-column layout
+        section_count += 1
+    return page.render(
+        resume=resume,
+        info=resume.get('personal_info') or {},
+        sections=sections,
+        section_count=section_count,
+        css=_css,
+    )
@@ -0,0 +1,86 @@
+import asyncio
+import os
+import subprocess
+import tempfile
+from dotenv import load_dotenv
+from utils.hashing import stable_hash
+from utils.pdf_cache import PdfCache
+from utils.pdf_service import RENDER_TIMEOUT_SECONDS
+from utils.render_pool import render_pool
+from utils.singleflight import SingleFlight
+from utils.templates import DEFAULT_TEMPLATE, render_resume_html, template_version
+
+load_dotenv()
+
+WKHTMLTOIMAGE_PATH = os.getenv('wkhtmltoimage', '/usr/local/bin/wkhtmltoimage')
+
+THUMBNAILS_ENABLED = os.getenv("THUMBNAILS_ENABLED", "true").lower() in ("1", "true", "yes")
+THUMBNAIL_WIDTH = int(os.getenv("THUMBNAIL_WIDTH", "300"))
+THUMBNAIL_CACHE_DIR = os.getenv(
+    "THUMBNAIL_CACHE_DIR", os.path.join(tempfile.gettempdir(), "resumecraft_thumbnails")
+)
+THUMBNAIL_CACHE_MAX_BYTES = int(os.getenv("THUMBNAIL_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# A4 at 96 dpi; the screen is cropped to the first page and scaled down to THUMBNAIL_WIDTH
+PAGE_WIDTH_PX, PAGE_HEIGHT_PX = 794, 1123
+THUMBNAIL_ZOOM = THUMBNAIL_WIDTH / PAGE_WIDTH_PX
+THUMBNAIL_OPTIONS = [
+    "--quiet",
+    "--format", "png",
+    "--enable-local-file-access",
+    "--disable-smart-width",
+    "--width", str(THUMBNAIL_WIDTH),
+    "--height", str(round(PAGE_HEIGHT_PX * THUMBNAIL_ZOOM)),
+    "--zoom", f"{THUMBNAIL_ZOOM:.4f}",
+]
+
+# Resolved on first use by thumbnail_version
+_version = None
+
+thumbnail_cache = PdfCache(THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_BYTES, extension=".png")
+thumbnail_flights = SingleFlight()
+
+class ThumbnailError(Exception):
+    pass
+
+def thumbnail_version() -> str:
+    """Part of every key: changing the render options or the templates retires the old thumbnails"""
+    global _version
+    if _version is None:
+        _version = stable_hash(
+            {"template": DEFAULT_TEMPLATE, "source": template_version(), "thumbnail": THUMBNAIL_OPTIONS}
+        )[:12]
+    return _version
+
+def thumbnail_key(resume: dict) -> str:
+    # Every update bumps the revision, so listings can hand out the key without reading the content
+    return f"{resume['_id']}.{resume.get('revision') or 0}.{thumbnail_version()}"
+
+def render_resume_thumbnail(resume: dict) -> bytes:
+    """First page of the default template as PNG bytes; runs in a render worker"""
+    html_content = render_resume_html(resume, DEFAULT_TEMPLATE)
+    try:
+        result = subprocess.run(
+            [WKHTMLTOIMAGE_PATH, *THUMBNAIL_OPTIONS, "-", "-"],
+            input=html_content.encode("utf-8"),
+            capture_output=True,
+            timeout=RENDER_TIMEOUT_SECONDS,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise ThumbnailError(f"wkhtmltoimage failed: {e}")
+    if result.returncode != 0 or not result.stdout:
+        raise ThumbnailError(f"wkhtmltoimage failed: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.stdout
+
+async def generate_thumbnail(resume: dict, key: str = None) -> str:
+    """Return the cached thumbnail path, rendering it once if this version has none"""
+    key = key or thumbnail_key(resume)
+
+    async def render():
+        path = thumbnail_cache.get(key)
+        if path is not None:
+            return path
+        png = await render_pool.run(render_resume_thumbnail, resume)
+        return await asyncio.to_thread(thumbnail_cache.put, key, png)
+
+    return await thumbnail_flights.do(key, render, timeout=RENDER_TIMEOUT_SECONDS)
@@ -0,0 +1,37 @@
+from typing import Optional
+import os
+import time
+from dotenv import load_dotenv
+from models.user import UserInDB
+from utils.lru import LRUCache
+
+load_dotenv()
+
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+# Bounds how long another worker process can serve a user changed elsewhere
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+class UserCache:
+    """Bounded LRU of authenticated users keyed by user id, with per-entry expiry"""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.ttl = ttl
+        self._entries = LRUCache(max_entries)  # user id -> (expires at, user)
+
+    def get(self, user_id: str) -> Optional[UserInDB]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if expires_at < time.monotonic():
+            self._entries.discard(user_id)
+            return None
+        return user
+
+    def put(self, user_id: str, user: UserInDB):
+        self._entries.put(user_id, (time.monotonic() + self.ttl, user))
+
+    def invalidate(self, user_id: str):
+        self._entries.discard(user_id)
+
+user_cache = UserCache(USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS)